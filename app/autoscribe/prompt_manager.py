@@ -5,7 +5,6 @@ Syncs with Azure Blob Storage for cross-device access.
 """
 
 import os
-import json
 import logging
 from pathlib import Path
 from enum import Enum
@@ -13,6 +12,8 @@ from typing import Optional, Dict, List, Any
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,6 +95,7 @@ class PromptManager:
         # Cache loaded prompts
         self._system_prompts: Dict[str, PromptTemplate] = {}
         self._custom_prompts: Dict[str, Dict[str, PromptTemplate]] = {}  # user_id -> prompts
+        self._registry_mtimes: Dict[str, float] = {}  # user_id -> registry mtime when decoded
 
         # Load system prompts on init
         self._load_system_prompts()
@@ -106,15 +108,18 @@ class PromptManager:
             "video_note.md": (PromptType.VIDEO_NOTE, "Video Note", "Video/telehealth visit note format"),
         }
 
+        # One directory scan instead of an exists() + stat() per file
+        with os.scandir(self.system_dir) as it:
+            entries = {entry.name: entry for entry in it if entry.is_file()}
+
         for filename, (prompt_type, name, description) in prompt_files.items():
-            filepath = self.system_dir / filename
-            if filepath.exists():
+            entry = entries.get(filename)
+            if entry is not None:
                 try:
-                    content = filepath.read_text(encoding="utf-8")
-                    now = datetime.now()
+                    content = Path(entry.path).read_text(encoding="utf-8")
 
                     # Get file modification time
-                    mtime = datetime.fromtimestamp(filepath.stat().st_mtime)
+                    mtime = datetime.fromtimestamp(entry.stat().st_mtime)
 
                     self._system_prompts[prompt_type.value] = PromptTemplate(
                         id=prompt_type.value,
@@ -162,24 +167,32 @@ class PromptManager:
         return list(self._custom_prompts.get(user_id, {}).values())
 
     def _load_user_prompts(self, user_id: str) -> None:
-        """Load custom prompts for a user from disk."""
-        user_dir = self.custom_dir / user_id
-        if not user_dir.exists():
+        """Load custom prompts for a user from disk.
+
+        The registry is only decoded again when its modification time has
+        changed since the last load, so repeated lookups reuse the cache.
+        """
+        registry_file = self.custom_dir / user_id / "registry.json"
+        try:
+            mtime = registry_file.stat().st_mtime
+        except OSError:
             self._custom_prompts[user_id] = {}
+            self._registry_mtimes.pop(user_id, None)
+            return
+
+        if self._registry_mtimes.get(user_id) == mtime and user_id in self._custom_prompts:
             return
 
         self._custom_prompts[user_id] = {}
 
-        # Load from registry file if exists
-        registry_file = user_dir / "registry.json"
-        if registry_file.exists():
-            try:
-                registry = json.loads(registry_file.read_text(encoding="utf-8"))
-                for prompt_data in registry.get("prompts", []):
-                    prompt = PromptTemplate.from_dict(prompt_data)
-                    self._custom_prompts[user_id][prompt.id] = prompt
-            except Exception as e:
-                logger.error(f"Failed to load user prompts registry: {e}")
+        try:
+            registry = orjson.loads(registry_file.read_bytes())
+            for prompt_data in registry.get("prompts", []):
+                prompt = PromptTemplate.from_dict(prompt_data)
+                self._custom_prompts[user_id][prompt.id] = prompt
+            self._registry_mtimes[user_id] = mtime
+        except Exception as e:
+            logger.error(f"Failed to load user prompts registry: {e}")
 
     def save_user_prompt(
         self,
@@ -240,7 +253,13 @@ class PromptManager:
         return prompt
 
     def _save_user_registry(self, user_id: str) -> None:
-        """Save user's prompts registry to disk."""
+        """Save user's prompts registry to disk.
+
+        The registry is hand-edited too, so it is written indented. The
+        file is written to a sibling temp file and swapped in with
+        os.replace so an interrupted save never leaves a truncated registry
+        behind.
+        """
         user_dir = self.custom_dir / user_id
         user_dir.mkdir(parents=True, exist_ok=True)
 
@@ -251,7 +270,12 @@ class PromptManager:
         }
 
         registry_file = user_dir / "registry.json"
-        registry_file.write_text(json.dumps(registry, indent=2), encoding="utf-8")
+        tmp_file = registry_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(orjson.dumps(registry, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, registry_file)
+
+        # The in-memory cache already matches what was just written
+        self._registry_mtimes[user_id] = registry_file.stat().st_mtime
 
     def delete_user_prompt(self, user_id: str, prompt_id: str) -> bool:
         """Delete a custom prompt.
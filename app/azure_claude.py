@@ -24,19 +24,23 @@ Usage:
 """
 
 import os
-import json
+import re
 import logging
 from enum import Enum
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fence around a JSON reply (closing fence optional)
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)(?:```|\Z)", re.DOTALL)
+
 
 class ModelTier(Enum):
     """Model tiers with cost/capability tradeoffs."""
@@ -84,21 +88,18 @@ class AzureClaudeClient:
         if not self.api_key:
             raise ValueError("AZURE_CLAUDE_API_KEY not configured")
 
-        # HTTP client with timeout
-        self.http_client = httpx.Client(timeout=60.0)
-
-    def _get_headers(self) -> Dict[str, str]:
-        """Get request headers for Azure Foundry Claude.
-
-        Azure AI Foundry with Anthropic models uses 'x-api-key' header
-        (Anthropic standard), not the Azure 'api-key' header.
-        """
-        return {
+        # Request headers never change after construction, so build them once.
+        # Azure AI Foundry with Anthropic models uses 'x-api-key' header
+        # (Anthropic standard), not the Azure 'api-key' header.
+        self._headers: Dict[str, str] = {
             "Content-Type": "application/json",
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
         }
 
+        # HTTP client with timeout
+        self.http_client = httpx.Client(timeout=60.0)
+
     def send_message(
         self,
         message: str,
@@ -139,7 +140,7 @@ class AzureClaudeClient:
 
         response = self.http_client.post(
             self.endpoint,
-            headers=self._get_headers(),
+            headers=self._headers,
             json=payload,
         )
 
@@ -147,14 +148,14 @@ class AzureClaudeClient:
             logger.error(f"Azure Claude error: {response.status_code} - {response.text}")
             raise Exception(f"Azure Claude API error: {response.status_code} - {response.text}")
 
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Extract response content
-        content = ""
-        if data.get("content"):
-            for block in data["content"]:
-                if block.get("type") == "text":
-                    content += block.get("text", "")
+        content = "".join(
+            block.get("text", "")
+            for block in data.get("content") or []
+            if block.get("type") == "text"
+        )
 
         return ClaudeResponse(
             content=content,
@@ -196,20 +197,20 @@ class AzureClaudeClient:
 
         response = self.http_client.post(
             self.endpoint,
-            headers=self._get_headers(),
+            headers=self._headers,
             json=payload,
         )
 
         if response.status_code != 200:
             raise Exception(f"Azure Claude API error: {response.status_code} - {response.text}")
 
-        data = response.json()
+        data = orjson.loads(response.content)
 
-        content = ""
-        if data.get("content"):
-            for block in data["content"]:
-                if block.get("type") == "text":
-                    content += block.get("text", "")
+        content = "".join(
+            block.get("text", "")
+            for block in data.get("content") or []
+            if block.get("type") == "text"
+        )
 
         return ClaudeResponse(
             content=content,
@@ -357,12 +358,11 @@ Return ONLY valid JSON, no explanation."""
     try:
         # Try to parse JSON from response
         content = response.content.strip()
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-        return json.loads(content)
-    except json.JSONDecodeError:
+        match = _FENCE_RE.search(content)
+        if match:
+            content = match.group(1)
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
         return {"raw_response": response.content, "parse_error": True}
 
 
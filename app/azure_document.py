@@ -19,23 +19,107 @@ Usage:
 
     # Extract consent form fields
     consent_data = client.extract_consent_form(file_bytes)
+
+    # OCR several documents concurrently
+    results = asyncio.run(client.analyze_many([page1, page2], "prebuilt-read"))
 """
 
 import os
+import re
+import time
+import asyncio
+import hashlib
+import functools
 import logging
-from typing import Optional, Dict, Any, List, BinaryIO
-from dataclasses import dataclass
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, List, BinaryIO, Tuple, Union
+from dataclasses import dataclass, replace
 from io import BytesIO
 
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import AnalyzeResult, AnalyzeDocumentRequest
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
+from azure.ai.documentintelligence.models import (
+    AnalyzeResult,
+    AnalyzeDocumentRequest,
+    AnalyzeBatchDocumentsRequest,
+    AzureBlobContentSource,
+    AzureBlobFileListContentSource,
+)
 from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import RequestsTransport
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Throughput limits for analyze calls (keeps us under the service's 429 threshold)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("AZURE_DOC_MAX_CONC", "3"))
+DEFAULT_RPS = float(os.getenv("AZURE_DOC_RPS", "5"))
+DEFAULT_RETRY_TOTAL = 3
+
+# Raw bytes, a binary file object, or a path to a file on disk
+DocumentSource = Union[bytes, BinaryIO, str, Path]
+
+# One keep-alive HTTPS pool shared by every sync client in the process
+_SHARED_SESSION = requests.Session()
+_SHARED_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Background pool for analyze calls submitted from the Streamlit script thread
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DEFAULT_MAX_CONCURRENCY,
+    thread_name_prefix="doc-analyze",
+)
+
+# Consent form markers, scanned over the whole OCR text in one pass.
+# "✓ " only counts when more text follows it on the line.
+_CONSENT_MARKER_RE = re.compile(
+    r"(?P<checkbox>\[x\]|\[✓\]|☑|✓ (?=[^\n]*\S)|yes:|no:)"
+    r"|(?P<date>date:|signed:|/20)",
+    re.IGNORECASE,
+)
+
+
+class _TokenBucket:
+    """Token bucket limiting how often analyze requests are submitted.
+
+    A caller reserves a token under a lock and is told how long to wait
+    for it, so the same bucket serves both threads and coroutines.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait on the event loop until a token is available."""
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
 
 @dataclass
 class ExtractedField:
@@ -52,8 +136,173 @@ class DocumentResult:
     content: str
     pages: int
     fields: Dict[str, ExtractedField]
-    tables: List[Dict[str, Any]]
-    raw_result: AnalyzeResult
+    tables: List[Dict[str, Any]]  # cells are (row, col, content) tuples
+    raw_result: Optional[AnalyzeResult] = None  # None when served from cache
+
+
+class DiskResultCache:
+    """Persistent analyze-result cache backed by ``diskcache``.
+
+    Survives process restarts, so a document already OCR'd in an earlier
+    session is not sent to Azure again. Cached results contain PHI - keep
+    the directory under data/ on the encrypted device.
+    """
+
+    def __init__(self, directory: Union[str, Path], expire: Optional[float] = None):
+        """Open (or create) the cache.
+
+        Args:
+            directory: Cache directory
+            expire: Optional entry lifetime in seconds
+        """
+        import diskcache
+
+        self._cache = diskcache.Cache(str(directory))
+        self.expire = expire
+
+    def get(self, key: str) -> Optional[DocumentResult]:
+        return self._cache.get(key)
+
+    def __setitem__(self, key: str, value: DocumentResult) -> None:
+        self._cache.set(key, value, expire=self.expire)
+
+
+def _materialize_result(result: AnalyzeResult) -> DocumentResult:
+    """Convert a raw SDK AnalyzeResult into a DocumentResult."""
+    # Extract fields
+    fields = {}
+    if result.documents:
+        for doc in result.documents:
+            if doc.fields:
+                for name, field in doc.fields.items():
+                    fields[name] = ExtractedField(
+                        name=name,
+                        value=field.value if hasattr(field, 'value') else field.content,
+                        confidence=field.confidence if hasattr(field, 'confidence') else 0.0,
+                    )
+
+    # Extract tables
+    tables = []
+    if result.tables:
+        for table in result.tables:
+            tables.append({
+                "rows": table.row_count,
+                "columns": table.column_count,
+                "cells": [
+                    (cell.row_index, cell.column_index, cell.content)
+                    for cell in table.cells or ()
+                ],
+            })
+
+    return DocumentResult(
+        content=result.content or "",
+        pages=len(result.pages) if result.pages else 0,
+        fields=fields,
+        tables=tables,
+        raw_result=result,
+    )
+
+
+@contextmanager
+def _document_body(document: DocumentSource):
+    """Yield a request body for the SDK, opening file paths as binary streams.
+
+    Streams are passed through as-is so the transport uploads them in
+    chunks instead of the whole file being read into memory first.
+    """
+    if isinstance(document, (str, Path)):
+        with open(document, "rb") as f:
+            yield f
+    else:
+        yield document
+
+
+def _fingerprint(body: Union[bytes, BinaryIO]) -> str:
+    """Hash document content, reading streams in chunks and rewinding them."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        digest.update(body)
+    else:
+        start = body.tell()
+        for chunk in iter(lambda: body.read(65536), b""):
+            digest.update(chunk)
+        body.seek(start)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(endpoint: str, api_key: str) -> DocumentIntelligenceClient:
+    """Return the process-wide sync client for an endpoint/key pair.
+
+    Streamlit reruns construct DocumentClient often; reusing the SDK client
+    and its pooled connections avoids a TLS handshake per OCR call.
+    """
+    return DocumentIntelligenceClient(
+        endpoint=endpoint,
+        credential=AzureKeyCredential(api_key),
+        transport=RequestsTransport(session=_SHARED_SESSION, session_owner=False),
+        retry_total=DEFAULT_RETRY_TOTAL,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_limits(
+    endpoint: str, max_concurrency: int, rps: float
+) -> Tuple[threading.BoundedSemaphore, _TokenBucket]:
+    """Return the process-wide concurrency slots and rate bucket for an endpoint.
+
+    Pages build a new DocumentClient on every rerun, so limits held per
+    instance would hand each session its own full quota against the one
+    shared SDK client. Clients asking for the same limits share them.
+    """
+    return threading.BoundedSemaphore(max_concurrency), _TokenBucket(rps)
+
+
+# Insurance card field mapping, checked in order: (card key, any-of, all-of).
+# The first rule whose substrings all appear in the lowered field name wins.
+_INSURANCE_FIELD_RULES = (
+    ("member_name", (), ("member", "name")),
+    ("member_id", (), ("member", "id")),
+    ("group_number", ("group",), ()),
+    ("plan_name", (), ("plan", "name")),
+    ("payer_name", ("payer", "insurer"), ()),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _insurance_card_key(field_name: str) -> Optional[str]:
+    """Map an Azure insurance card field name to a card_data key (or None).
+
+    Field names come from a small fixed schema, so the substring tests run
+    once per distinct name and later documents hit the cache.
+    """
+    name_lower = field_name.lower()
+    for key, any_of, all_of in _INSURANCE_FIELD_RULES:
+        if any_of and not any(part in name_lower for part in any_of):
+            continue
+        if all(part in name_lower for part in all_of):
+            return key
+    return None
+
+
+def _marker_lines(content: str) -> Dict[str, List[str]]:
+    """Collect stripped lines containing checkbox or date markers.
+
+    Each line is reported at most once per marker kind, in document order.
+    Line bounds are found around each hit, so the text is never split.
+    """
+    found: Dict[str, List[str]] = {"checkbox": [], "date": []}
+    last_start = {"checkbox": -1, "date": -1}
+    for match in _CONSENT_MARKER_RE.finditer(content):
+        kind = match.lastgroup
+        pos = match.start()
+        start = content.rfind("\n", 0, pos) + 1
+        if start == last_start[kind]:
+            continue
+        last_start[kind] = start
+        end = content.find("\n", pos)
+        found[kind].append(content[start:end if end != -1 else len(content)].strip())
+    return found
 
 
 class DocumentClient:
@@ -77,12 +326,20 @@ class DocumentClient:
         self,
         endpoint: Optional[str] = None,
         api_key: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rps: float = DEFAULT_RPS,
+        cache: Optional[Any] = None,
     ):
         """Initialize Document Intelligence client.
 
         Args:
             endpoint: Azure endpoint (defaults to env var)
             api_key: API key (defaults to env var)
+            max_concurrency: Maximum analyses in flight at once
+            rps: Maximum analyze requests submitted per second
+            cache: Optional result cache keyed by document hash + model.
+                A dict or anything with get() and item assignment,
+                e.g. DiskResultCache.
         """
         self.endpoint = endpoint or os.getenv("AZURE_DOC_INTELLIGENCE_ENDPOINT")
         self.api_key = api_key or os.getenv("AZURE_DOC_INTELLIGENCE_KEY")
@@ -95,80 +352,302 @@ class DocumentClient:
         # Remove trailing slash if present
         self.endpoint = self.endpoint.rstrip("/")
 
-        self.client = DocumentIntelligenceClient(
-            endpoint=self.endpoint,
-            credential=AzureKeyCredential(self.api_key),
-        )
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self._slots, self._bucket = _get_limits(self.endpoint, max_concurrency, rps)
+
+        self.client = _get_client(self.endpoint, self.api_key)
+
+    def _cache_key(self, body: Union[bytes, BinaryIO], model_id: str) -> Optional[str]:
+        """Fingerprint a document + model pair for the result cache."""
+        if self.cache is None:
+            return None
+        return f"{_fingerprint(body)}:{model_id}"
+
+    def _cache_get(self, key: Optional[str]) -> Optional[DocumentResult]:
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Document analysis served from cache")
+        return cached
+
+    def _cache_put(self, key: Optional[str], result: DocumentResult) -> DocumentResult:
+        if key is not None:
+            # The raw SDK result is large and not needed to rebuild the result
+            self.cache[key] = replace(result, raw_result=None)
+        return result
 
     def analyze_document(
         self,
-        document: bytes,
+        document: DocumentSource,
         model_id: str = "prebuilt-document",
     ) -> DocumentResult:
         """Analyze a document using specified model.
 
         Args:
-            document: Document bytes (PDF, image, etc.)
+            document: Document bytes, binary file object, or file path
+                (PDF, image, etc.)
             model_id: Model to use (see MODELS dict)
 
         Returns:
             DocumentResult with extracted content
         """
-        logger.info(f"Analyzing document with model: {model_id}")
+        with _document_body(document) as body:
+            cache_key = self._cache_key(body, model_id)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            logger.info(f"Analyzing document with model: {model_id}")
+
+            with self._slots:
+                self._bucket.acquire()
+
+                # Start analysis - SDK 1.0+ uses 'body' parameter
+                poller = self.client.begin_analyze_document(
+                    model_id=model_id,
+                    body=body,
+                    content_type="application/octet-stream",
+                )
+
+                # Wait for result
+                result = poller.result()
+
+        return self._cache_put(cache_key, _materialize_result(result))
+
+    def submit_analyze(
+        self,
+        document: DocumentSource,
+        model_id: str = "prebuilt-document",
+    ) -> "Future[DocumentResult]":
+        """Run analyze_document on a background thread.
+
+        Lets a Streamlit page keep rendering while OCR runs - keep the
+        future in st.session_state and check .done() on later reruns.
+
+        Args:
+            document: Document bytes, binary file object, or file path
+            model_id: Model to use (see MODELS dict)
+
+        Returns:
+            Future resolving to the DocumentResult
+        """
+        return _EXECUTOR.submit(self.analyze_document, document, model_id)
+
+    def start_analyze(
+        self,
+        document: DocumentSource,
+        model_id: str = "prebuilt-document",
+    ) -> Tuple[str, str]:
+        """Submit a document for analysis without waiting for the result.
 
-        # Start analysis - SDK 1.0+ uses 'body' parameter
+        Store the returned continuation token (database, session state)
+        before doing anything else - finish_analyze() can pick the operation
+        back up after a worker restart instead of re-running the OCR.
+
+        Args:
+            document: Document bytes, binary file object, or file path
+            model_id: Model to use (see MODELS dict)
+
+        Returns:
+            Tuple of (operation_id, continuation_token)
+        """
+        logger.info(f"Submitting document for analysis with model: {model_id}")
+
+        self._bucket.acquire()
+        with _document_body(document) as body:
+            poller = self.client.begin_analyze_document(
+                model_id=model_id,
+                body=body,
+                content_type="application/octet-stream",
+            )
+        return poller.details["operation_id"], poller.continuation_token()
+
+    def finish_analyze(
+        self,
+        continuation_token: str,
+        poll_interval: float = 1,
+    ) -> DocumentResult:
+        """Wait for an analysis started with start_analyze().
+
+        Args:
+            continuation_token: Token returned by start_analyze()
+            poll_interval: Seconds between status polls; raise it for
+                large multi-page documents
+
+        Returns:
+            DocumentResult with extracted content
+        """
         poller = self.client.begin_analyze_document(
-            model_id=model_id,
-            body=document,
-            content_type="application/octet-stream",
+            None,
+            None,
+            continuation_token=continuation_token,
+            polling_interval=poll_interval,
         )
+        return _materialize_result(poller.result())
 
-        # Wait for result
+    async def _analyze_async(
+        self,
+        aio_client: AsyncDocumentIntelligenceClient,
+        document: DocumentSource,
+        model_id: str,
+    ) -> DocumentResult:
+        """Analyze one document on the async client without blocking the loop."""
+        with _document_body(document) as body:
+            cache_key = self._cache_key(body, model_id)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            await self._bucket.acquire_async()
+            poller = await aio_client.begin_analyze_document(
+                model_id=model_id,
+                body=body,
+                content_type="application/octet-stream",
+            )
+            result = await poller.result()
+
+        # Large layout results take a while to convert; do it on a worker
+        # thread so the loop keeps polling the other documents meanwhile.
+        materialized = await asyncio.to_thread(_materialize_result, result)
+        return self._cache_put(cache_key, materialized)
+
+    async def analyze_many(
+        self,
+        documents: List[DocumentSource],
+        model_id: str = "prebuilt-document",
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Analyze several documents concurrently.
+
+        OCR is network-bound, so up to ``max_concurrency`` operations are
+        kept in flight at once instead of waiting on each document in turn.
+
+        Args:
+            documents: Documents to analyze (bytes, file objects, or paths)
+            model_id: Model to use (see MODELS dict)
+            max_concurrency: Maximum number of concurrent analyses
+                (defaults to the client's max_concurrency)
+            return_exceptions: Return failures in place of results
+                instead of raising the first one
+
+        Returns:
+            List of DocumentResult in the same order as ``documents``
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        # The async transport is bound to the running event loop, so the
+        # client lives for the duration of this call.
+        async with AsyncDocumentIntelligenceClient(
+            endpoint=self.endpoint,
+            credential=AzureKeyCredential(self.api_key),
+            retry_total=DEFAULT_RETRY_TOTAL,
+        ) as aio_client:
+
+            async def analyze_one(document: DocumentSource) -> DocumentResult:
+                async with semaphore:
+                    return await self._analyze_async(aio_client, document, model_id)
+
+            return await asyncio.gather(
+                *(analyze_one(document) for document in documents),
+                return_exceptions=return_exceptions,
+            )
+
+    def analyze_batch(
+        self,
+        source_container_url: str,
+        result_container_url: str,
+        model_id: str = "prebuilt-layout",
+        *,
+        result_prefix: Optional[str] = None,
+        overwrite_existing: bool = False,
+        file_list_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Start one batch analysis over every document in a blob container.
+
+        A single operation replaces one analyze call per document. Results
+        are written to ``result_container_url`` and this returns as soon as
+        the operation is accepted - use get_batch_result() to wait for it.
+
+        Args:
+            source_container_url: SAS URL of the container holding the documents
+            result_container_url: SAS URL of the container receiving results
+            model_id: Model to use (see MODELS dict)
+            result_prefix: Optional blob prefix for result files
+            overwrite_existing: Replace results already in the result container
+            file_list_path: Optional blob path of a JSONL file listing the
+                documents to process instead of the whole container
+
+        Returns:
+            Dict with operation_id and continuation_token for resuming
+        """
+        if file_list_path:
+            source = {
+                "azure_blob_file_list_source": AzureBlobFileListContentSource(
+                    container_url=source_container_url,
+                    file_list=file_list_path,
+                )
+            }
+        else:
+            source = {
+                "azure_blob_source": AzureBlobContentSource(container_url=source_container_url)
+            }
+
+        request = AnalyzeBatchDocumentsRequest(
+            result_container_url=result_container_url,
+            result_prefix=result_prefix,
+            overwrite_existing=overwrite_existing,
+            **source,
+        )
+
+        logger.info(f"Starting batch analysis with model: {model_id}")
+        poller = self.client.begin_analyze_batch_documents(model_id=model_id, body=request)
+
+        return {
+            "operation_id": poller.details["operation_id"],
+            "continuation_token": poller.continuation_token(),
+            "result_container_url": result_container_url,
+            "result_prefix": result_prefix,
+        }
+
+    def get_batch_result(self, continuation_token: str) -> Dict[str, Any]:
+        """Wait for a batch analysis started by analyze_batch().
+
+        Args:
+            continuation_token: Token returned by analyze_batch()
+
+        Returns:
+            Dict with per-status document counts and per-document details
+        """
+        poller = self.client.begin_analyze_batch_documents(
+            None,
+            None,
+            continuation_token=continuation_token,
+        )
         result = poller.result()
 
-        # Extract fields
-        fields = {}
-        if result.documents:
-            for doc in result.documents:
-                if doc.fields:
-                    for name, field in doc.fields.items():
-                        fields[name] = ExtractedField(
-                            name=name,
-                            value=field.value if hasattr(field, 'value') else field.content,
-                            confidence=field.confidence if hasattr(field, 'confidence') else 0.0,
-                        )
-
-        # Extract tables
-        tables = []
-        if result.tables:
-            for table in result.tables:
-                table_data = {
-                    "rows": table.row_count,
-                    "columns": table.column_count,
-                    "cells": [],
+        return {
+            "succeeded": result.succeeded_count,
+            "failed": result.failed_count,
+            "skipped": result.skipped_count,
+            "details": [
+                {
+                    "source_url": detail.source_url,
+                    "result_url": detail.result_url,
+                    "status": detail.status,
+                    "error": detail.error.message if detail.error else None,
                 }
-                if table.cells:
-                    for cell in table.cells:
-                        table_data["cells"].append({
-                            "row": cell.row_index,
-                            "col": cell.column_index,
-                            "content": cell.content,
-                        })
-                tables.append(table_data)
-
-        return DocumentResult(
-            content=result.content or "",
-            pages=len(result.pages) if result.pages else 0,
-            fields=fields,
-            tables=tables,
-            raw_result=result,
-        )
+                for detail in (result.details or [])
+            ],
+        }
 
-    def extract_text(self, document: bytes) -> str:
+    def extract_text(self, document: DocumentSource) -> str:
         """Extract plain text from a document using OCR.
 
         Args:
-            document: Document bytes
+            document: Document bytes, binary file object, or file path
 
         Returns:
             Extracted text content
@@ -176,18 +655,18 @@ class DocumentClient:
         result = self.analyze_document(document, "prebuilt-read")
         return result.content
 
-    def extract_layout(self, document: bytes) -> DocumentResult:
+    def extract_layout(self, document: DocumentSource) -> DocumentResult:
         """Extract document layout with tables and structure.
 
         Args:
-            document: Document bytes
+            document: Document bytes, binary file object, or file path
 
         Returns:
             DocumentResult with layout information
         """
         return self.analyze_document(document, "prebuilt-layout")
 
-    def extract_health_insurance_card(self, document: bytes) -> Dict[str, Any]:
+    def extract_health_insurance_card(self, document: DocumentSource) -> Dict[str, Any]:
         """Extract health insurance card information.
 
         Args:
@@ -215,23 +694,15 @@ class DocumentClient:
             card_data["raw_fields"][name] = field.value
 
             # Map known fields
-            name_lower = name.lower()
-            if "member" in name_lower and "name" in name_lower:
-                card_data["member_name"] = field.value
-            elif "member" in name_lower and "id" in name_lower:
-                card_data["member_id"] = field.value
-            elif "group" in name_lower:
-                card_data["group_number"] = field.value
-            elif "plan" in name_lower and "name" in name_lower:
-                card_data["plan_name"] = field.value
-            elif "payer" in name_lower or "insurer" in name_lower:
-                card_data["payer_name"] = field.value
+            key = _insurance_card_key(name)
+            if key is not None:
+                card_data[key] = field.value
 
         return card_data
 
     def extract_consent_form(
         self,
-        document: bytes,
+        document: DocumentSource,
         use_ai_parsing: bool = True,
     ) -> Dict[str, Any]:
         """Extract consent form fields using OCR + optional AI parsing.
@@ -255,16 +726,10 @@ class DocumentClient:
             "parsed_elections": None,
         }
 
-        # Look for checkbox-like patterns in the text
-        lines = result.content.split("\n")
-        for line in lines:
-            line_lower = line.lower().strip()
-            # Look for checkbox indicators
-            if any(marker in line_lower for marker in ["[x]", "[✓]", "☑", "✓ ", "yes:", "no:"]):
-                consent_data["checkboxes"].append(line.strip())
-            # Look for date patterns
-            if any(date_word in line_lower for date_word in ["date:", "signed:", "/20"]):
-                consent_data["dates"].append(line.strip())
+        # Look for checkbox indicators and date patterns in the text
+        markers = _marker_lines(result.content or "")
+        consent_data["checkboxes"] = markers["checkbox"]
+        consent_data["dates"] = markers["date"]
 
         # Use AI to parse if enabled
         if use_ai_parsing and result.content:
@@ -4,15 +4,73 @@ Displays current logged-in user with logout option.
 Tracks session for HIPAA audit compliance.
 """
 
+import functools
+import secrets
+import time
 import streamlit as st
 from datetime import datetime
 from typing import Optional, Dict, Any
-import uuid
+
+# Banner markup is constant apart from the user and session suffix, so it is
+# built once at import instead of re-interpolated on every rerun.
+_BANNER_TMPL = """
+            <div style="
+                background: linear-gradient(90deg, #1e3a5f 0%, #2c5282 100%);
+                padding: 8px 16px;
+                border-radius: 8px;
+                color: white;
+                display: flex;
+                align-items: center;
+                gap: 10px;
+            ">
+                <span style="font-size: 1.1em;">👤</span>
+                <span><strong>Logged in:</strong> {user}</span>
+                <span style="opacity: 0.7; font-size: 0.85em; margin-left: auto;">
+                    Session: {sid}
+                </span>
+            </div>
+            """
+
+_MISSING = object()
+
+
+@functools.singledispatch
+def _display_name(user: Any, missing: Optional[str] = None) -> Any:
+    """Return the email or name to show for a user object.
+
+    Dispatches on type once instead of probing with hasattr chains. Dict
+    users fall back to ``missing`` (or their id) when neither key is set.
+    """
+    email = getattr(user, 'email', _MISSING)
+    if email is not _MISSING:
+        return email
+    name = getattr(user, 'name', _MISSING)
+    if name is not _MISSING:
+        return name
+    return str(user)
+
+
+@_display_name.register(dict)
+def _(user: dict, missing: Optional[str] = None) -> str:
+    if missing is None:
+        missing = str(user.get('id', 'Unknown'))
+    return user.get('email') or user.get('name') or missing
+
+
+@functools.singledispatch
+def _user_id(user: Any) -> str:
+    user_id = getattr(user, 'id', _MISSING)
+    return str(user if user_id is _MISSING else user_id)
+
+
+@_user_id.register(dict)
+def _(user: dict) -> str:
+    return str(user.get('id', user.get('email', 'unknown')))
 
 
 def generate_session_id() -> str:
     """Generate a unique session ID."""
-    return f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    return f"session_{int(time.time())}_{secrets.token_hex(8)}"
 
 
 def init_session_tracking() -> str:
@@ -24,6 +82,7 @@ def init_session_tracking() -> str:
     if "autoscribe_session_id" not in st.session_state:
         st.session_state.autoscribe_session_id = generate_session_id()
         st.session_state.autoscribe_session_start = datetime.now()
+        st.session_state.autoscribe_session_start_mono = time.monotonic()
 
     return st.session_state.autoscribe_session_id
 
@@ -34,9 +93,8 @@ def get_session_duration() -> Optional[int]:
     Returns:
         Duration in seconds, or None if session not started
     """
-    if "autoscribe_session_start" in st.session_state:
-        duration = datetime.now() - st.session_state.autoscribe_session_start
-        return int(duration.total_seconds())
+    if "autoscribe_session_start_mono" in st.session_state:
+        return int(time.monotonic() - st.session_state.autoscribe_session_start_mono)
     return None
 
 
@@ -56,37 +114,14 @@ def show_user_banner(
     session_id = init_session_tracking()
 
     # Get user display info
-    if hasattr(user, 'email'):
-        user_display = user.email
-    elif hasattr(user, 'name'):
-        user_display = user.name
-    elif isinstance(user, dict):
-        user_display = user.get('email') or user.get('name') or str(user.get('id', 'Unknown'))
-    else:
-        user_display = str(user)
+    user_display = _display_name(user)
 
     # Create banner container
     banner_col1, banner_col2 = st.columns([4, 1])
 
     with banner_col1:
         st.markdown(
-            f"""
-            <div style="
-                background: linear-gradient(90deg, #1e3a5f 0%, #2c5282 100%);
-                padding: 8px 16px;
-                border-radius: 8px;
-                color: white;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            ">
-                <span style="font-size: 1.1em;">👤</span>
-                <span><strong>Logged in:</strong> {user_display}</span>
-                <span style="opacity: 0.7; font-size: 0.85em; margin-left: auto;">
-                    Session: {session_id[-12:]}
-                </span>
-            </div>
-            """,
+            _BANNER_TMPL.format(user=user_display, sid=session_id[-12:]),
             unsafe_allow_html=True
         )
 
@@ -128,6 +163,8 @@ def _handle_logout(user: Any, session_id: str, callback: Optional[callable] = No
         del st.session_state.autoscribe_session_id
     if "autoscribe_session_start" in st.session_state:
         del st.session_state.autoscribe_session_start
+    if "autoscribe_session_start_mono" in st.session_state:
+        del st.session_state.autoscribe_session_start_mono
 
     # Call custom callback if provided
     if callback:
@@ -152,13 +189,7 @@ def show_compact_user_info(user: Any) -> str:
     Returns:
         Formatted user string
     """
-    if hasattr(user, 'email'):
-        return user.email
-    elif hasattr(user, 'name'):
-        return user.name
-    elif isinstance(user, dict):
-        return user.get('email') or user.get('name') or 'Unknown User'
-    return str(user)
+    return _display_name(user, 'Unknown User')
 
 
 def get_user_id(user: Any) -> str:
@@ -170,8 +201,4 @@ def get_user_id(user: Any) -> str:
     Returns:
         User ID string
     """
-    if hasattr(user, 'id'):
-        return str(user.id)
-    elif isinstance(user, dict):
-        return str(user.get('id', user.get('email', 'unknown')))
-    return str(user)
+    return _user_id(user)
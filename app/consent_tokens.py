@@ -16,6 +16,9 @@ import string
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import joinedload
+
 from database import get_session
 from database.models import Patient, Consent, ConsentStatus
 
@@ -23,6 +26,14 @@ from database.models import Patient, Consent, ConsentStatus
 # Token configuration
 TOKEN_LENGTH = 16  # 16 chars of base62 = 62^16 possibilities
 TOKEN_EXPIRATION_DAYS = 30  # Tokens valid for 30 days
+IN_CLAUSE_CHUNK = 900  # Stay under SQLite's bound-parameter limit
+
+# Random bytes map onto base62 via a translate table. Bytes >= 248 (62 * 4)
+# are dropped rather than wrapped so every character stays equally likely.
+_ALPHABET = (string.ascii_letters + string.digits).encode()
+_UNBIASED_LIMIT = 256 - 256 % len(_ALPHABET)
+_BASE62_TABLE = bytes(_ALPHABET[b % len(_ALPHABET)] for b in range(256))
+_REJECT_BYTES = bytes(range(_UNBIASED_LIMIT, 256))
 
 
 def generate_token() -> str:
@@ -30,8 +41,51 @@ def generate_token() -> str:
 
     Uses base62 (alphanumeric) to avoid URL encoding issues.
     """
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(TOKEN_LENGTH))
+    token = b""
+    while len(token) < TOKEN_LENGTH:
+        raw = secrets.token_bytes(TOKEN_LENGTH + 4)
+        token += raw.translate(_BASE62_TABLE, _REJECT_BYTES)
+    return token[:TOKEN_LENGTH].decode("ascii")
+
+
+def _chunks(items: list, size: int = IN_CLAUSE_CHUNK):
+    """Yield successive slices of items for IN (...) queries."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _generate_unique_tokens(session, count: int) -> list:
+    """Generate count tokens not already assigned, checking the database in bulk.
+
+    Collisions are effectively impossible at 62^16, so one IN (...) lookup
+    per chunk replaces a SELECT per token; only colliding entries are
+    regenerated.
+    """
+    tokens = [generate_token() for _ in range(count)]
+
+    for _ in range(10):
+        taken = set()
+        for batch in _chunks(tokens):
+            taken.update(
+                row[0] for row in session.query(Patient.consent_token).filter(
+                    Patient.consent_token.in_(batch)
+                )
+            )
+
+        seen = set()
+        collisions = []
+        for i, token in enumerate(tokens):
+            if token in taken or token in seen:
+                collisions.append(i)
+            seen.add(token)
+
+        if not collisions:
+            return tokens
+
+        for i in collisions:
+            tokens[i] = generate_token()
+
+    raise RuntimeError("Failed to generate unique tokens after 10 attempts")
 
 
 def create_patient_token(
@@ -136,41 +190,55 @@ def batch_create_tokens(
     try:
         expires = datetime.utcnow() + timedelta(days=expiration_days)
 
-        for patient_id in patient_ids:
-            try:
-                patient = session.query(Patient).filter(Patient.id == patient_id).first()
-                if not patient:
-                    results[patient_id] = {"token": None, "expires": None, "error": "Patient not found"}
-                    continue
-
-                # Generate unique token
-                for _ in range(10):
-                    token = generate_token()
-                    existing = session.query(Patient).filter(
-                        Patient.consent_token == token
-                    ).first()
-                    if not existing:
-                        break
-                else:
-                    results[patient_id] = {"token": None, "expires": None, "error": "Token generation failed"}
-                    continue
-
-                # Update patient
-                patient.consent_token = token
-                patient.consent_token_expires = expires
-
-                # Update consent status
-                if patient.consent and patient.consent.status == ConsentStatus.PENDING:
-                    patient.consent.status = ConsentStatus.INVITATION_SENT
-                    patient.consent.last_outreach_date = datetime.utcnow()
-                    patient.consent.outreach_method = "consent_token"
-                    patient.consent.outreach_attempts = (patient.consent.outreach_attempts or 0) + 1
-
-                results[patient_id] = {"token": token, "expires": expires, "error": None}
-
-            except Exception as e:
-                results[patient_id] = {"token": None, "expires": None, "error": str(e)}
+        now = datetime.utcnow()
+
+        # Patients are updated in bulk below, so only load the columns
+        # needed to decide what to write
+        patients = {}
+        for batch in _chunks(list(patient_ids)):
+            rows = session.query(
+                Patient.id, Consent.id, Consent.status, Consent.outreach_attempts
+            ).outerjoin(Consent, Consent.patient_id == Patient.id).filter(
+                Patient.id.in_(batch)
+            )
+            patients.update((row[0], row) for row in rows)
+
+        tokens = iter(_generate_unique_tokens(session, len(patient_ids)))
+
+        # Keyed by primary key so a repeated patient_id is written once
+        patient_updates = {}
+        consent_updates = {}
 
+        for patient_id in patient_ids:
+            row = patients.get(patient_id)
+            if not row:
+                results[patient_id] = {"token": None, "expires": None, "error": "Patient not found"}
+                continue
+
+            _, consent_id, consent_status, outreach_attempts = row
+            token = next(tokens)
+
+            patient_updates[patient_id] = {
+                "id": patient_id,
+                "consent_token": token,
+                "consent_token_expires": expires,
+            }
+
+            # Move pending consents to invitation_sent
+            if consent_id is not None and consent_status == ConsentStatus.PENDING:
+                consent_updates[consent_id] = {
+                    "id": consent_id,
+                    "status": ConsentStatus.INVITATION_SENT,
+                    "last_outreach_date": now,
+                    "outreach_method": "consent_token",
+                    "outreach_attempts": (outreach_attempts or 0) + 1,
+                }
+
+            results[patient_id] = {"token": token, "expires": expires, "error": None}
+
+        # One executemany per table instead of a flush per patient
+        session.bulk_update_mappings(Patient, list(patient_updates.values()))
+        session.bulk_update_mappings(Consent, list(consent_updates.values()))
         session.commit()
 
     except Exception as e:
@@ -241,36 +309,32 @@ def get_outreach_summary() -> dict:
     """
     session = get_session()
     try:
-        total = session.query(Patient).count()
-
-        with_token = session.query(Patient).filter(
-            Patient.consent_token.isnot(None)
-        ).count()
-
-        token_expired = session.query(Patient).filter(
-            Patient.consent_token.isnot(None),
-            Patient.consent_token_expires < datetime.utcnow()
-        ).count()
+        now = datetime.utcnow()
+        has_token = Patient.consent_token.isnot(None)
+        apcm = Patient.apcm_enrolled == True
+
+        # All patient counters in a single pass over the table
+        totals = session.query(
+            func.count(Patient.id).label("total"),
+            func.count(case((has_token, 1))).label("with_token"),
+            func.count(case((and_(has_token, Patient.consent_token_expires < now), 1))).label("expired"),
+            func.count(case((and_(apcm, Patient.apcm_continue_with_hometeam.is_(None)), 1))).label("apcm_pending"),
+            func.count(case((and_(apcm, Patient.apcm_continue_with_hometeam.isnot(None)), 1))).label("apcm_decided"),
+        ).one()
+
+        total = totals.total
+        with_token = totals.with_token
+        token_expired = totals.expired
+        apcm_pending = totals.apcm_pending
+        apcm_decided = totals.apcm_decided
 
         # Consent status breakdown
-        from sqlalchemy import func
         consent_stats = session.query(
             Consent.status, func.count(Consent.id)
         ).group_by(Consent.status).all()
 
         consent_by_status = {status.value: count for status, count in consent_stats}
 
-        # APCM-specific
-        apcm_pending = session.query(Patient).filter(
-            Patient.apcm_enrolled == True,
-            Patient.apcm_continue_with_hometeam.is_(None)
-        ).count()
-
-        apcm_decided = session.query(Patient).filter(
-            Patient.apcm_enrolled == True,
-            Patient.apcm_continue_with_hometeam.isnot(None)
-        ).count()
-
         return {
             "total_patients": total,
             "with_token": with_token,
@@ -293,11 +357,13 @@ def get_patients_needing_tokens(filter_type: str = "all") -> list:
         filter_type: "all", "apcm_only", "spruce_matched", "no_token"
 
     Returns:
-        List of Patient objects
+        List of Patient objects (with consent eagerly loaded)
     """
     session = get_session()
     try:
-        query = session.query(Patient)
+        # Callers read patient.consent after the session closes, so load it
+        # in the same JOIN rather than lazily (which would fail detached).
+        query = session.query(Patient).options(joinedload(Patient.consent))
 
         if filter_type == "no_token":
             query = query.filter(Patient.consent_token.is_(None))
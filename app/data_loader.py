@@ -9,7 +9,13 @@ And reconciles everything into the SQLite database.
 """
 
 import os
+import re
 import sys
+import time
+import functools
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
@@ -20,15 +26,86 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
+from sqlalchemy import and_, case, func, literal, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from database import get_session
 from database.models import Patient, Consent, ConsentStatus, APCMStatus, APCMLevel
 
+IN_CLAUSE_CHUNK = 900  # Stay under SQLite's bound-parameter limit
+PROGRESS_INTERVAL = 0.2  # Minimum seconds between import progress updates
+
+_NON_DIGITS = re.compile(r"\D")
+
+# Minimum fuzz.ratio (0-100) for a fuzzy name fallback match, applied to
+# "last first" and to the first name alone. A one-letter change in a first
+# name under 10 letters scores below 90 ("mary" vs "mark" is 75).
+FUZZY_NAME_CUTOFF = 90
+
+# Input file name patterns, matched case-insensitively in priority order.
+# Supports: "GreenPatients.xlsx", "dr green patient list.xls", etc.
+_PATIENT_FILE_PATTERNS = [
+    re.compile(r"patient.*list.*\.xls", re.IGNORECASE),
+    re.compile(r"GreenPatients.*\.xls", re.IGNORECASE),
+    re.compile(r"patients.*\.xls", re.IGNORECASE),
+]
+_APCM_FILE_PATTERNS = [re.compile(r"APCM.*\.xlsx?$", re.IGNORECASE)]
+
+# Columns refreshed on existing patients by each import
+_SPRUCE_FIELDS = ("spruce_matched", "spruce_id", "spruce_match_method", "spruce_suggested_id")
+_APCM_FIELDS = (
+    "apcm_enrolled", "apcm_signup_date", "apcm_level", "apcm_icd_codes",
+    "apcm_status", "apcm_status_notes", "apcm_insurance", "apcm_copay",
+)
+
+# APCM spreadsheet values -> database enums
+_LEVEL_ENUM_MAP = {
+    "G0556": APCMLevel.LEVEL_1,
+    "G0557": APCMLevel.LEVEL_2,
+    "G0558": APCMLevel.LEVEL_3,
+}
+_APCM_STATUS_MAP = {
+    "active": APCMStatus.ACTIVE,
+    "removed": APCMStatus.REMOVED,
+}
+
+# How long fetched Spruce contacts and their indexes are reused (seconds)
+SPRUCE_CACHE_TTL = int(os.getenv("SPRUCE_CACHE_TTL", 300))
+
+
+def _ttl_cache(ttl: float):
+    """Cache a no-argument function's result for ttl seconds.
+
+    Exceptions are not cached. Like functools.lru_cache, the wrapper
+    exposes cache_clear() for explicit invalidation.
+    """
+    def decorator(func):
+        lock = threading.Lock()
+        entry = {}
+
+        @functools.wraps(func)
+        def wrapper():
+            with lock:
+                if entry and time.monotonic() - entry["at"] < ttl:
+                    return entry["value"]
+                value = func()
+                entry.update(at=time.monotonic(), value=value)
+                return value
+
+        def cache_clear():
+            with lock:
+                entry.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
 
 def normalize_phone(phone: str) -> Optional[str]:
     """Normalize phone number to first 10 digits for matching."""
     if not phone:
         return None
-    digits = "".join(c for c in str(phone) if c.isdigit())
+    digits = _NON_DIGITS.sub("", str(phone))
     if len(digits) >= 10:
         return digits[:10]  # First 10 digits (Excel data has trailing extra digit)
     return digits if digits else None
@@ -41,23 +118,31 @@ def normalize_name(name: str) -> str:
     return str(name).lower().strip()
 
 
+@_ttl_cache(SPRUCE_CACHE_TTL)
 def fetch_spruce_contacts() -> Tuple[List, Dict, Dict]:
     """Fetch all contacts from Spruce and build lookup indexes.
 
+    Results are reused for SPRUCE_CACHE_TTL seconds so repeated imports
+    skip the API round-trip; call fetch_spruce_contacts.cache_clear() to
+    force a refresh.
+
     Returns:
         Tuple of (contacts_list, phone_index, name_index)
     """
+    import httpx
     from phase0.spruce import SpruceClient
 
-    client = SpruceClient()
-    if not client.test_connection():
-        raise ConnectionError("Failed to connect to Spruce API")
-
-    contacts = client.get_contacts()
+    # No separate test_connection() probe: the first contacts page fails the
+    # same way, so a bad token or network error costs no extra round-trip.
+    try:
+        with SpruceClient() as client:
+            contacts = client.get_contacts()
+    except (httpx.HTTPError, PermissionError, RuntimeError, ValueError) as e:
+        raise ConnectionError(f"Failed to connect to Spruce API: {e}") from e
 
     # Build indexes for fast matching
     phone_index = {}
-    name_index = {}
+    name_index = defaultdict(list)
 
     for contact in contacts:
         # Phone index (normalized to first 10 digits)
@@ -69,11 +154,9 @@ def fetch_spruce_contacts() -> Tuple[List, Dict, Dict]:
         # Name index (last_name, first_name normalized)
         if contact.first_name and contact.last_name:
             key = (normalize_name(contact.last_name), normalize_name(contact.first_name))
-            if key not in name_index:
-                name_index[key] = []
             name_index[key].append(contact)
 
-    return contacts, phone_index, name_index
+    return contacts, phone_index, dict(name_index)
 
 
 def match_patient_to_spruce(patient, phone_index: Dict, name_index: Dict) -> Tuple[bool, Optional[str], Optional[str]]:
@@ -84,21 +167,180 @@ def match_patient_to_spruce(patient, phone_index: Dict, name_index: Dict) -> Tup
     """
     # Try phone match first (most reliable)
     if patient.phone:
-        patient_phone = normalize_phone(patient.phone)
-        if patient_phone in phone_index:
-            contact = phone_index[patient_phone]
+        contact = phone_index.get(normalize_phone(patient.phone))
+        if contact is not None:
             return (True, contact.spruce_id, "phone")
 
     # Try name match
     if patient.first_name and patient.last_name:
-        key = (normalize_name(patient.last_name), normalize_name(patient.first_name))
-        if key in name_index:
-            contact = name_index[key][0]  # Take first match
+        candidates = name_index.get(
+            (normalize_name(patient.last_name), normalize_name(patient.first_name))
+        )
+        if candidates:
+            contact = candidates[0]  # Take first match
             return (True, contact.spruce_id, "name")
 
     return (False, None, None)
 
 
+def fuzzy_match_names(patients: List, contacts: List, score_cutoff: int = FUZZY_NAME_CUTOFF) -> Dict[int, object]:
+    """Fuzzy-match patient names to Spruce contacts for exact-match misses.
+
+    Compares "last first" strings with RapidFuzz (normalized Levenshtein),
+    scoring every patient against every contact in one cdist call. A hit is
+    only accepted when it is unambiguous, the first letters of both last
+    and first name agree, and the first names alone also reach
+    score_cutoff, so near-identical names of different people (e.g.
+    "Mary" vs "Mark") are not paired.
+
+    A name hit alone is not proof of identity; see _fuzzy_hit_confirmed.
+
+    Args:
+        patients: Patient records with first_name/last_name
+        contacts: Spruce contacts with first_name/last_name/spruce_id
+        score_cutoff: Minimum similarity score (0-100)
+
+    Returns:
+        Dict mapping index into patients -> matched Spruce contact
+    """
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        return {}
+
+    choice_keys, choice_contacts = [], []
+    for contact in contacts:
+        if contact.first_name and contact.last_name:
+            choice_keys.append((normalize_name(contact.last_name), normalize_name(contact.first_name)))
+            choice_contacts.append(contact)
+
+    query_keys, query_idx = [], []
+    for i, patient in enumerate(patients):
+        if patient.first_name and patient.last_name:
+            query_keys.append((normalize_name(patient.last_name), normalize_name(patient.first_name)))
+            query_idx.append(i)
+
+    if not choice_keys or not query_keys:
+        return {}
+
+    scores = process.cdist(
+        [f"{last} {first}" for last, first in query_keys],
+        [f"{last} {first}" for last, first in choice_keys],
+        scorer=fuzz.ratio,
+        score_cutoff=score_cutoff,
+        workers=-1,
+    )
+
+    matches = {}
+    for row, best in enumerate(scores.argmax(axis=1)):
+        top = scores[row, best]
+        if not top:
+            continue
+        # Skip ties between different Spruce contacts
+        tied = (scores[row] == top).nonzero()[0]
+        if len({choice_contacts[col].spruce_id for col in tied}) > 1:
+            continue
+        (q_last, q_first), (c_last, c_first) = query_keys[row], choice_keys[best]
+        if q_last[:1] != c_last[:1] or q_first[:1] != c_first[:1]:
+            continue
+        if fuzz.ratio(q_first, c_first) < score_cutoff:
+            continue
+        matches[query_idx[row]] = choice_contacts[best]
+    return matches
+
+
+def _fuzzy_hit_confirmed(patient, contact) -> bool:
+    """True if something besides the name ties a fuzzy hit to the patient.
+
+    Outreach messages go to the linked Spruce contact, so a fuzzy name hit
+    is only linked when the DOB, phone or email also agrees.
+    """
+    if patient.date_of_birth and patient.date_of_birth == getattr(contact, "date_of_birth", None):
+        return True
+    phone = normalize_phone(patient.phone)
+    if phone and len(phone) == 10 and phone == normalize_phone(contact.phone):
+        return True
+    email = (getattr(patient, "email", None) or "").strip().lower()
+    return bool(email) and email == (getattr(contact, "email", None) or "").strip().lower()
+
+
+def _scan_import_dirs(dirs: List[Path]) -> List[Tuple[int, os.DirEntry]]:
+    """List candidate files in each directory with one scandir pass apiece.
+
+    Returns (directory rank, entry) pairs; hidden files and Excel "~$"
+    lock files are skipped.
+    """
+    entries = []
+    for rank, directory in enumerate(dirs):
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as it:
+            entries.extend(
+                (rank, entry) for entry in it
+                if entry.is_file() and not entry.name.startswith((".", "~$"))
+            )
+    return entries
+
+
+def _pick_file(entries: List[Tuple[int, os.DirEntry]], patterns: List[re.Pattern]) -> Optional[Path]:
+    """Return the best file for the first pattern that matches anything.
+
+    Earlier directories win; within a directory the newest file wins.
+    """
+    for pattern in patterns:
+        hits = [(rank, entry) for rank, entry in entries if pattern.search(entry.name)]
+        if hits:
+            _, entry = min(hits, key=lambda hit: (hit[0], -hit[1].stat().st_mtime))
+            return Path(entry.path)
+    return None
+
+
+def _load_existing_mrns(session, mrns: List[str]) -> set:
+    """Return which of the given MRNs are already in the database.
+
+    Uses chunked IN (...) queries instead of one SELECT per patient.
+    """
+    mrns = list(dict.fromkeys(mrn for mrn in mrns if mrn))
+    existing = set()
+    for i in range(0, len(mrns), IN_CLAUSE_CHUNK):
+        batch = mrns[i:i + IN_CLAUSE_CHUNK]
+        existing.update(
+            mrn for (mrn,) in session.query(Patient.mrn).filter(Patient.mrn.in_(batch))
+        )
+    return existing
+
+
+def _patient_upsert(update_apcm: bool, now: datetime):
+    """Build INSERT ... ON CONFLICT(mrn) DO UPDATE for imported patients.
+
+    New MRNs are inserted with every column. Existing rows only get their
+    Spruce match refreshed, plus the APCM fields when update_apcm is set;
+    an existing preferred name is never overwritten. Rows whose values
+    already match are left alone, so re-imports don't rewrite (or bump
+    updated_at on) unchanged patients.
+    """
+    stmt = sqlite_insert(Patient)
+    excluded = stmt.excluded
+    columns = Patient.__table__.c
+    fields = _SPRUCE_FIELDS + (_APCM_FIELDS if update_apcm else ())
+    set_ = {name: excluded[name] for name in fields}
+    changed = [columns[name].is_distinct_from(excluded[name]) for name in fields]
+    if update_apcm:
+        current = columns.preferred_name
+        fill_name = and_(func.coalesce(excluded.preferred_name, "") != "",
+                         func.coalesce(current, "") == "")
+        set_["preferred_name"] = case(
+            (fill_name, excluded.preferred_name),
+            else_=current,
+        )
+        changed.append(fill_name)
+    # onupdate defaults don't fire for ON CONFLICT updates
+    set_["updated_at"] = now
+    return stmt.on_conflict_do_update(
+        index_elements=["mrn"], set_=set_, where=or_(*changed)
+    )
+
+
 def import_all_data(progress_callback=None) -> Dict[str, int]:
     """Import all patient data from Excel and match with Spruce.
 
@@ -125,136 +367,119 @@ def import_all_data(progress_callback=None) -> Dict[str, int]:
     data_dir = Path(__file__).parent.parent / "data"
     imports_dir = data_dir / "imports"
 
-    # Step 1: Load Spruce contacts
-    if progress_callback:
-        progress_callback("Connecting to Spruce API...", 0, 100)
-
-    try:
-        spruce_contacts, phone_index, name_index = fetch_spruce_contacts()
-        results["spruce_total"] = len(spruce_contacts)
-    except Exception as e:
-        # Continue without Spruce matching if API fails
-        spruce_contacts, phone_index, name_index = [], {}, {}
-        results["errors"] += 1
-
-    if progress_callback:
-        progress_callback(f"Loaded {len(spruce_contacts)} Spruce contacts", 10, 100)
-
-    # Step 2: Load patients from Excel (check both data/ and data/imports/)
-    # Look for patient Excel files with flexible naming patterns
-    # Supports: "GreenPatients.xlsx", "dr green patient list.xls", etc.
-    patient_patterns = ["*patient*list*.xls*", "*GreenPatients*.xls*", "*patients*.xls*"]
-    excel_files = []
-    for pattern in patient_patterns:
-        excel_files.extend(data_dir.glob(pattern))
-        if imports_dir.exists():
-            excel_files.extend(imports_dir.glob(pattern))
-        if excel_files:
-            break
-    # Remove duplicates while preserving order
-    excel_files = list(dict.fromkeys(excel_files))
-    if not excel_files:
+    # Locate input files (check both data/ and data/imports/)
+    import_entries = _scan_import_dirs([data_dir, imports_dir])
+    patient_file = _pick_file(import_entries, _PATIENT_FILE_PATTERNS)
+    if patient_file is None:
         raise FileNotFoundError(
             "No patient Excel file found in data/ or data/imports/. "
             "Looking for files matching: *patient*list*.xls*, *GreenPatients*.xls*, or *patients*.xls*"
         )
+    apcm_file = _pick_file(import_entries, _APCM_FILE_PATTERNS)
 
+    # Steps 1-3: Spruce contacts, patient Excel and APCM Excel are independent,
+    # so load them concurrently; wall time is the slowest one, not the sum.
     if progress_callback:
-        progress_callback("Loading patient Excel file...", 15, 100)
+        progress_callback("Loading Spruce contacts and Excel files...", 0, 100)
 
-    patients = load_patients_from_excel(str(excel_files[0]))
-
-    if progress_callback:
-        progress_callback(f"Loaded {len(patients)} patients from Excel", 25, 100)
-
-    # Step 3: Load APCM data (check both data/ and data/imports/)
-    apcm_files = list(data_dir.glob("*APCM*.xlsx")) + list(data_dir.glob("*APCM*.xls"))
-    if not apcm_files and imports_dir.exists():
-        apcm_files = list(imports_dir.glob("*APCM*.xlsx")) + list(imports_dir.glob("*APCM*.xls"))
+    spruce_contacts, phone_index, name_index = [], {}, {}
     apcm_data = {"active": [], "removed": []}
-    apcm_by_mrn = {}
 
-    if apcm_files:
-        if progress_callback:
-            progress_callback("Loading APCM Excel file...", 30, 100)
-
-        apcm_data = load_apcm_patients(str(apcm_files[0]))
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="import-load") as pool:
+        futures = {
+            pool.submit(fetch_spruce_contacts): "spruce",
+            # A full list, not iter_patients_from_excel: the Spruce pre-pass
+            # and the MRN lookup below need every patient before the upsert
+            pool.submit(load_patients_from_excel, str(patient_file)): "patients",
+        }
+        if apcm_file:
+            futures[pool.submit(load_apcm_patients, str(apcm_file))] = "apcm"
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            stage = futures[future]
+            pct = 35 * done // len(futures)
+
+            if stage == "spruce":
+                try:
+                    spruce_contacts, phone_index, name_index = future.result()
+                    results["spruce_total"] = len(spruce_contacts)
+                except Exception:
+                    # Continue without Spruce matching if API fails
+                    results["errors"] += 1
+                message = f"Loaded {len(spruce_contacts)} Spruce contacts"
+            elif stage == "patients":
+                patients = future.result()
+                message = f"Loaded {len(patients)} patients from Excel"
+            else:
+                apcm_data = future.result()
+                message = f"Loaded {len(apcm_data['active'])} active APCM patients"
 
-        # Build MRN lookup
-        for p in apcm_data["active"] + apcm_data["removed"]:
-            if p["mrn"]:
-                apcm_by_mrn[p["mrn"]] = p
+            if progress_callback:
+                progress_callback(message, pct, 100)
 
-    if progress_callback:
-        progress_callback(f"Loaded {len(apcm_data['active'])} active APCM patients", 35, 100)
+    # Build APCM MRN lookup
+    apcm_by_mrn = {}
+    for p in apcm_data["active"] + apcm_data["removed"]:
+        if p["mrn"]:
+            apcm_by_mrn[p["mrn"]] = p
+
+    # Match with Spruce: exact phone/name first, then a fuzzy name fallback
+    spruce_matches = [match_patient_to_spruce(p, phone_index, name_index) for p in patients]
+    unmatched = [i for i, (matched, _, _) in enumerate(spruce_matches) if not matched]
+    fuzzy_suggestions: Dict[int, str] = {}
+    if unmatched and spruce_contacts:
+        fuzzy = fuzzy_match_names([patients[i] for i in unmatched], spruce_contacts)
+        for j, contact in fuzzy.items():
+            i = unmatched[j]
+            if _fuzzy_hit_confirmed(patients[i], contact):
+                spruce_matches[i] = (True, contact.spruce_id, "fuzzy_name")
+            else:
+                # Unconfirmed: kept as a suggestion for staff review only
+                fuzzy_suggestions[i] = contact.spruce_id
+                spruce_matches[i] = (False, None, "fuzzy_pending")
 
     # Step 4: Import/update patients in database
     session = get_session()
     total_patients = len(patients)
 
     try:
-        for i, p in enumerate(patients):
-            if progress_callback and i % 50 == 0:
-                pct = 35 + int((i / total_patients) * 55)
-                progress_callback(f"Processing patient {i+1}/{total_patients}...", pct, 100)
-
-            # Match with Spruce
-            matched, spruce_id, match_method = match_patient_to_spruce(p, phone_index, name_index)
-            if matched:
-                results["spruce_matched"] += 1
-
-            # Get APCM data if available
-            apcm_info = apcm_by_mrn.get(p.mrn, {})
-
-            # Determine APCM level enum
-            level_enum = None
-            if apcm_info.get("level_code") == "G0556":
-                level_enum = APCMLevel.LEVEL_1
-            elif apcm_info.get("level_code") == "G0557":
-                level_enum = APCMLevel.LEVEL_2
-            elif apcm_info.get("level_code") == "G0558":
-                level_enum = APCMLevel.LEVEL_3
-
-            # Determine APCM status
-            apcm_status = APCMStatus.NOT_ENROLLED
-            if apcm_info:
-                if apcm_info.get("status") == "active":
-                    apcm_status = APCMStatus.ACTIVE
+        # One BEGIN/COMMIT around every read and write of the import;
+        # rolls back automatically if anything raises.
+        with session.begin():
+            existing_mrns = _load_existing_mrns(session, [p.mrn for p in patients])
+            apcm_rows = []
+            spruce_only_rows = []
+
+            # Throttle progress by wall time: each callback re-renders a
+            # Streamlit widget, so at most one update per PROGRESS_INTERVAL.
+            next_tick = 0.0
+
+            for i, p in enumerate(patients):
+                if progress_callback and time.monotonic() >= next_tick:
+                    next_tick = time.monotonic() + PROGRESS_INTERVAL
+                    pct = 35 + int((i / total_patients) * 55)
+                    progress_callback(f"Processing patient {i+1}/{total_patients}...", pct, 100)
+
+                matched, spruce_id, match_method = spruce_matches[i]
+                if matched:
+                    results["spruce_matched"] += 1
+
+                # Get APCM data if available
+                apcm_info = apcm_by_mrn.get(p.mrn, {})
+                apcm_get = apcm_info.get
+                status = apcm_get("status")
+
+                # Determine APCM level and status enums
+                level_enum = _LEVEL_ENUM_MAP.get(apcm_get("level_code"))
+                apcm_status = _APCM_STATUS_MAP.get(status, APCMStatus.NOT_ENROLLED)
+                if apcm_status is APCMStatus.ACTIVE:
                     results["apcm_imported"] += 1
-                elif apcm_info.get("status") == "removed":
-                    apcm_status = APCMStatus.REMOVED
-
-            # Check if patient exists
-            existing = session.query(Patient).filter(Patient.mrn == p.mrn).first()
 
-            if existing:
-                # Update existing patient
-                existing.spruce_matched = matched
-                existing.spruce_id = spruce_id
-                existing.spruce_match_method = match_method
-
-                # Update APCM fields
-                if apcm_info:
-                    existing.apcm_enrolled = (apcm_info.get("status") == "active")
-                    existing.apcm_signup_date = apcm_info.get("signup_date")
-                    existing.apcm_level = level_enum
-                    existing.apcm_icd_codes = apcm_info.get("icd_codes")
-                    existing.apcm_status = apcm_status
-                    existing.apcm_status_notes = apcm_info.get("status_notes")
-                    existing.apcm_insurance = apcm_info.get("insurance")
-                    existing.apcm_copay = apcm_info.get("copay")
-                    if apcm_info.get("preferred_name") and not existing.preferred_name:
-                        existing.preferred_name = apcm_info.get("preferred_name")
-                    results["apcm_updated"] += 1
-
-                results["patients_updated"] += 1
-            else:
-                # Create new patient
-                db_patient = Patient(
+                row = dict(
                     mrn=p.mrn,
                     first_name=p.first_name,
                     last_name=p.last_name,
-                    date_of_birth=str(p.date_of_birth) if p.date_of_birth else None,
+                    date_of_birth=p.date_of_birth,
                     phone=p.phone,
                     email=p.email,
                     address=p.address,
@@ -264,34 +489,61 @@ def import_all_data(progress_callback=None) -> Dict[str, int]:
                     spruce_matched=matched,
                     spruce_id=spruce_id,
                     spruce_match_method=match_method,
+                    spruce_suggested_id=fuzzy_suggestions.get(i),
                     # APCM fields
-                    preferred_name=apcm_info.get("preferred_name"),
-                    apcm_enrolled=(apcm_info.get("status") == "active") if apcm_info else False,
-                    apcm_signup_date=apcm_info.get("signup_date"),
+                    preferred_name=apcm_get("preferred_name"),
+                    apcm_enrolled=status == "active",
+                    apcm_signup_date=apcm_get("signup_date"),
                     apcm_level=level_enum,
-                    apcm_icd_codes=apcm_info.get("icd_codes"),
+                    apcm_icd_codes=apcm_get("icd_codes"),
                     apcm_status=apcm_status,
-                    apcm_status_notes=apcm_info.get("status_notes"),
-                    apcm_insurance=apcm_info.get("insurance"),
-                    apcm_copay=apcm_info.get("copay"),
+                    apcm_status_notes=apcm_get("status_notes"),
+                    apcm_insurance=apcm_get("insurance"),
+                    apcm_copay=apcm_get("copay"),
                 )
-                session.add(db_patient)
-
-                # Create pending consent record
-                consent = Consent(patient=db_patient, status=ConsentStatus.PENDING)
-                session.add(consent)
 
-                results["patients_imported"] += 1
-
-        session.commit()
+                if apcm_info:
+                    apcm_rows.append(row)
+                else:
+                    spruce_only_rows.append(row)
+
+                if p.mrn in existing_mrns:
+                    if apcm_info:
+                        results["apcm_updated"] += 1
+                    results["patients_updated"] += 1
+                else:
+                    results["patients_imported"] += 1
+
+            # Insert new patients and refresh existing ones in one executemany
+            # upsert per column set, keyed on the unique MRN
+            now = datetime.utcnow()
+            if apcm_rows:
+                session.execute(_patient_upsert(True, now), apcm_rows)
+            if spruce_only_rows:
+                session.execute(_patient_upsert(False, now), spruce_only_rows)
+
+            # Create pending consent records for the newly inserted patients
+            new_mrns = list(dict.fromkeys(
+                p.mrn for p in patients if p.mrn and p.mrn not in existing_mrns
+            ))
+            pending = literal(ConsentStatus.PENDING, Consent.__table__.c.status.type)
+            for i in range(0, len(new_mrns), IN_CLAUSE_CHUNK):
+                batch = new_mrns[i:i + IN_CLAUSE_CHUNK]
+                session.execute(
+                    sqlite_insert(Consent)
+                    .from_select(
+                        ["patient_id", "status"],
+                        select(Patient.id, pending).where(Patient.mrn.in_(batch)),
+                    )
+                    .on_conflict_do_nothing(index_elements=["patient_id"])
+                )
 
         if progress_callback:
             progress_callback("Import complete!", 100, 100)
 
-    except Exception as e:
-        session.rollback()
+    except Exception:
         results["errors"] += 1
-        raise e
+        raise
     finally:
         session.close()
 
@@ -302,22 +554,28 @@ def get_import_summary() -> Dict:
     """Get summary of current database state."""
     session = get_session()
     try:
-        total = session.query(Patient).count()
-        spruce_matched = session.query(Patient).filter(Patient.spruce_matched == True).count()
-        apcm_active = session.query(Patient).filter(Patient.apcm_status == APCMStatus.ACTIVE).count()
-        apcm_removed = session.query(Patient).filter(Patient.apcm_status == APCMStatus.REMOVED).count()
-
-        pending_consent = session.query(Consent).filter(Consent.status == ConsentStatus.PENDING).count()
-        consented = session.query(Consent).filter(Consent.status == ConsentStatus.CONSENTED).count()
+        def consent_count(status):
+            return select(func.count(Consent.id)).where(Consent.status == status).scalar_subquery()
+
+        # Every counter in one statement: one pass over patients plus two
+        # scalar subqueries over consents
+        counts = session.query(
+            func.count(Patient.id).label("total"),
+            func.count(case((Patient.spruce_matched == True, 1))).label("spruce_matched"),
+            func.count(case((Patient.apcm_status == APCMStatus.ACTIVE, 1))).label("apcm_active"),
+            func.count(case((Patient.apcm_status == APCMStatus.REMOVED, 1))).label("apcm_removed"),
+            consent_count(ConsentStatus.PENDING).label("pending_consent"),
+            consent_count(ConsentStatus.CONSENTED).label("consented"),
+        ).one()
 
         return {
-            "total_patients": total,
-            "spruce_matched": spruce_matched,
-            "spruce_unmatched": total - spruce_matched,
-            "apcm_active": apcm_active,
-            "apcm_removed": apcm_removed,
-            "pending_consent": pending_consent,
-            "consented": consented,
+            "total_patients": counts.total,
+            "spruce_matched": counts.spruce_matched,
+            "spruce_unmatched": counts.total - counts.spruce_matched,
+            "apcm_active": counts.apcm_active,
+            "apcm_removed": counts.apcm_removed,
+            "pending_consent": counts.pending_consent,
+            "consented": counts.consented,
         }
     finally:
         session.close()
@@ -1,12 +1,14 @@
 # Database module
-from .connection import get_session, init_db, engine
+from .connection import (
+    get_session, get_scoped_session, init_db, engine, checkpoint_db, count_rows
+)
 from .models import (
-    Base, Patient, Consent, AuditLog, User,
+    Base, Patient, PatientICDCode, Consent, ConsentStatsRollup, AuditLog, User,
     ConsentStatus, APCMStatus, APCMLevel, UserRole
 )
 
 __all__ = [
-    "get_session", "init_db", "engine",
-    "Base", "Patient", "Consent", "AuditLog", "User",
+    "get_session", "get_scoped_session", "init_db", "engine", "checkpoint_db", "count_rows",
+    "Base", "Patient", "PatientICDCode", "Consent", "ConsentStatsRollup", "AuditLog", "User",
     "ConsentStatus", "APCMStatus", "APCMLevel", "UserRole"
 ]
@@ -1,9 +1,16 @@
 """Database connection and session management for Patient Explorer."""
 
 import os
+import logging
+import threading
+from datetime import date, datetime
+from typing import Optional
 from pathlib import Path
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, func, inspect, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+logger = logging.getLogger(__name__)
 
 # Default database path in project data directory
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
@@ -12,16 +19,62 @@ DATABASE_PATH = os.getenv("DATABASE_PATH", str(DATA_DIR / "patients.db"))
 # Ensure data directory exists
 Path(DATABASE_PATH).parent.mkdir(parents=True, exist_ok=True)
 
+# Connection pool: "queue" (default) keeps a pool of reusable connections,
+# "null" opens a fresh connection per checkout (no long-lived connections
+# to go stale), "static" shares one connection (single-threaded use only)
+DB_POOLCLASS = os.getenv("DB_POOLCLASS", "queue").lower()
+
+_POOL_OPTIONS = {
+    # Sized for several open browser tabs rather than QueuePool's default of 5
+    "queue": {"pool_size": 10, "max_overflow": 20},
+    "null": {"poolclass": NullPool},
+    "static": {"poolclass": StaticPool},
+}
+
+if DB_POOLCLASS not in _POOL_OPTIONS:
+    raise ValueError(
+        f"DB_POOLCLASS must be one of {', '.join(_POOL_OPTIONS)}, got {DB_POOLCLASS!r}"
+    )
+
 # Create SQLite engine with settings for Streamlit
-# check_same_thread=False is required for Streamlit's multi-threaded execution
+# check_same_thread=False is required for Streamlit's multi-threaded execution.
+# Each script run checks out its own connection (WAL lets readers run
+# alongside a writer); timeout makes a writer wait up to 30s for the lock
+# instead of failing with "database is locked".
 engine = create_engine(
     f"sqlite:///{DATABASE_PATH}",
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False, "timeout": 30},
     echo=False,  # Set to True for SQL debugging
+    **_POOL_OPTIONS[DB_POOLCLASS],
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection for bulk writes and dashboard reads.
+
+    WAL lets readers proceed during an import and, with synchronous=NORMAL,
+    avoids an fsync per commit; temp tables and a 64 MB page cache stay in
+    memory, and reads of the first 256 MB go through mmap instead of
+    read() copies. foreign_keys is off by default in SQLite, so the
+    declared ForeignKeys are only enforced with it turned on.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps loaded attributes readable after commit, so
+# objects handed to Streamlit widgets don't trigger a reload per attribute.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 def get_session():
@@ -38,8 +91,197 @@ def get_session():
     return SessionLocal()
 
 
+# Thread-local registry: each Streamlit script thread gets the same Session
+# back on every rerun instead of building a new one
+ScopedSession = scoped_session(SessionLocal)
+
+
+def get_scoped_session():
+    """Get this thread's reusable database session.
+
+    Call close() when done: it returns the connection to the pool and
+    ends the transaction, but the Session itself is kept for the next
+    call on the same thread.
+    """
+    return ScopedSession()
+
+
+# Pages call init_db() on every rerun; the schema work only needs to run
+# once per process (and again after checkpoint_db(release=True), since the
+# database file may have been replaced)
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def count_rows(session, model, *criteria, join=None) -> int:
+    """Return COUNT(*) of model rows matching criteria.
+
+    Emits a flat SELECT count(*) FROM table [JOIN ...] WHERE ..., unlike
+    Query.count() which wraps the full entity SELECT in a subquery.
+    """
+    stmt = select(func.count()).select_from(model)
+    if join is not None:
+        stmt = stmt.join(join)
+    if criteria:
+        stmt = stmt.where(*criteria)
+    return session.execute(stmt).scalar_one()
+
+
 def init_db():
-    """Create all tables if they don't exist."""
-    from .models import Base
-    Base.metadata.create_all(bind=engine)
+    """Create all tables, indexes and roll-up triggers if they don't exist."""
+    global _initialized
+    with _init_lock:
+        if not _initialized:
+            _create_schema()
+            _initialized = True
     return True
+
+
+def _create_schema():
+    from .models import (
+        Base, CONSENT_STATS_TRIGGERS, CONSENT_STATS_REBUILD,
+        CONSENT_STATUS_TRIGGERS, CONSENT_STATUS_BACKFILL,
+        ICD_CODE_TRIGGERS, ICD_CODE_BACKFILL,
+    )
+    Base.metadata.create_all(bind=engine)
+
+    # create_all skips tables that already exist, so columns and indexes
+    # added to the models later are created here to upgrade existing
+    # databases in place.
+    with engine.begin() as conn:
+        _add_missing_columns(conn, Base.metadata)
+        _normalize_dates_of_birth(conn)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        # patients.current_consent_status mirrors consents.status
+        for ddl in CONSENT_STATUS_TRIGGERS:
+            conn.exec_driver_sql(ddl)
+        conn.exec_driver_sql(CONSENT_STATUS_BACKFILL)
+
+        # patient_icd_codes splits patients.apcm_icd_codes into rows
+        for ddl in ICD_CODE_TRIGGERS:
+            conn.exec_driver_sql(ddl)
+        conn.exec_driver_sql(ICD_CODE_BACKFILL)
+
+        # consent_stats is maintained incrementally by triggers; recount it
+        # once at startup in case the file was written without them
+        for ddl in CONSENT_STATS_TRIGGERS:
+            conn.exec_driver_sql(ddl)
+        conn.exec_driver_sql(CONSENT_STATS_REBUILD)
+
+
+def _add_missing_columns(conn, metadata):
+    """ALTER TABLE ... ADD COLUMN for model columns the database lacks.
+
+    Only nullable, non-unique columns can be added this way in SQLite,
+    which is all new columns need to be for existing rows.
+    """
+    inspector = inspect(conn)
+    for table in metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(
+                f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+            )
+
+
+# Formats date_of_birth was written in while it was a String column, tried
+# on the date part only (any time part is stripped first)
+_DOB_FORMATS = (
+    "%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%Y/%m/%d", "%m/%d/%y", "%m-%d-%y",
+)
+
+
+def _parse_legacy_dob(value) -> Optional[date]:
+    """Parse a legacy date_of_birth value, or return None if it can't be."""
+    text = str(value).strip()
+    # "1950-01-02 00:00:00", "1950-01-02T00:00:00", "1/2/1950 12:00 AM"
+    text = text.split("T")[0] if text[:4].isdigit() else text
+    text = text.split(" ")[0]
+    for fmt in _DOB_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+        # %y puts 00-68 in the 2000s; a birth date can't be in the future
+        if parsed > date.today():
+            parsed = parsed.replace(year=parsed.year - 100)
+        return parsed
+    return None
+
+
+def _normalize_dates_of_birth(conn):
+    """Rewrite legacy date_of_birth text as YYYY-MM-DD for the Date type.
+
+    The Date type can only read valid ISO dates back, so every stored value
+    is checked, and ones in another format (or with a time part) are
+    re-parsed. The original text is copied to patient_dob_legacy before
+    a row is rewritten. If any value can't be parsed, nothing is changed
+    and init_db stops with the affected patient ids: DOB is never cleared.
+    """
+    rows = conn.exec_driver_sql(
+        "SELECT id, date_of_birth FROM patients WHERE date_of_birth IS NOT NULL"
+    ).all()
+    updates = []
+    unparseable = []
+    for patient_id, value in rows:
+        if isinstance(value, str) and len(value) == 10:
+            try:
+                date.fromisoformat(value)
+                continue  # Already a valid ISO date
+            except ValueError:
+                pass
+        parsed = _parse_legacy_dob(value)
+        if parsed is None:
+            unparseable.append(patient_id)
+        else:
+            updates.append((parsed.isoformat(), patient_id))
+
+    if unparseable:
+        raise RuntimeError(
+            f"{len(unparseable)} patients have a date_of_birth that can't be "
+            f"converted to a date (patient ids: {unparseable}). Correct them "
+            "as YYYY-MM-DD, then restart; no DOB values were changed."
+        )
+    if not updates:
+        return
+
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS patient_dob_legacy ("
+        "patient_id INTEGER PRIMARY KEY, date_of_birth TEXT NOT NULL, "
+        "migrated_at TEXT NOT NULL)"
+    )
+    # Keep the first original if a row is somehow migrated twice
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO patient_dob_legacy (patient_id, date_of_birth, migrated_at) "
+        "SELECT id, date_of_birth, datetime('now') FROM patients WHERE id = ?",
+        [(patient_id,) for _, patient_id in updates],
+    )
+    conn.exec_driver_sql(
+        "UPDATE patients SET date_of_birth = ? WHERE id = ?", updates
+    )
+    logger.info(
+        f"Converted {len(updates)} date_of_birth values to YYYY-MM-DD "
+        "(originals kept in patient_dob_legacy)"
+    )
+
+
+def checkpoint_db(release: bool = False):
+    """Fold the WAL file back into the main database file.
+
+    Call before copying or hashing the .db file directly (SharePoint sync),
+    since committed writes can still live in the -wal file. With
+    release=True pooled connections are also closed so the file can be
+    replaced safely.
+    """
+    global _initialized
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    if release:
+        engine.dispose()
+        _initialized = False
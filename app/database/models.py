@@ -3,12 +3,23 @@
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum
+    Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey, Enum, Index,
+    literal_column, select,
 )
 from sqlalchemy.orm import DeclarativeBase, relationship
 import enum
 
 
+# Current UTC time computed by SQLite inside the INSERT itself, so there is
+# no Python call or bound value per row. %f only gives milliseconds; the
+# zero padding matches the microsecond text SQLAlchemy writes for Python
+# datetimes, so every value in a column shares one format.
+# onupdate stays datetime.utcnow: an SQL-expression onupdate leaves the
+# attribute expired after flush, and with expire_on_commit=False reading it
+# from a closed session would raise DetachedInstanceError.
+UTC_NOW = literal_column("strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'")
+
+
 class Base(DeclarativeBase):
     """Base class for all models."""
     pass
@@ -57,7 +68,7 @@ class Patient(Base):
     mrn = Column(String(50), unique=True, nullable=False, index=True)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
-    date_of_birth = Column(String(20))  # Stored as string from Excel
+    date_of_birth = Column(Date, index=True)  # Parsed to a date at import
     phone = Column(String(20))
     email = Column(String(255))
     address = Column(String(255))
@@ -66,9 +77,11 @@ class Patient(Base):
     zip_code = Column(String(20))
 
     # Spruce matching info
-    spruce_matched = Column(Boolean, default=False)
+    spruce_matched = Column(Boolean, default=False, index=True)
     spruce_id = Column(String(100))
-    spruce_match_method = Column(String(50))  # 'phone', 'name', 'email'
+    spruce_match_method = Column(String(50))  # 'phone', 'name', 'fuzzy_name', 'fuzzy_pending', 'email'
+    # Unconfirmed fuzzy name match awaiting review; never used for outreach
+    spruce_suggested_id = Column(String(100))
 
     # Preferred name (parsed from "First Name" column, e.g., 'Patricia "Pat"' -> 'Pat')
     preferred_name = Column(String(100))
@@ -93,19 +106,108 @@ class Patient(Base):
     consent_token_expires = Column(DateTime)
     consent_portal_visited = Column(DateTime)
 
+    # Copy of consents.status kept in sync by CONSENT_STATUS_TRIGGERS so
+    # list views can show status without loading the consent row
+    # (None when the patient has no consent record)
+    current_consent_status = Column(Enum(ConsentStatus), index=True)
+
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     consent = relationship("Consent", back_populates="patient", uselist=False)
     audit_logs = relationship("AuditLog", back_populates="patient")
-    notes = relationship("PatientNote", back_populates="patient", order_by="PatientNote.created_at.desc()")
+    # Dynamic: patient.notes is a query, so loading a Patient never pulls in
+    # (and sorts) its notes; use .limit()/.count() on it as needed
+    notes = relationship(
+        "PatientNote", back_populates="patient", lazy="dynamic",
+        order_by="PatientNote.created_at.desc()",
+    )
+    # One row per code in apcm_icd_codes, written by ICD_CODE_TRIGGERS
+    icd_codes = relationship(
+        "PatientICDCode", viewonly=True, order_by="PatientICDCode.icd_code",
+    )
+
+    # APCM status filters, optionally narrowed by enrollment; the leading
+    # column also serves status-only lookups
+    __table_args__ = (
+        Index("ix_patients_apcm_status_enrolled", "apcm_status", "apcm_enrolled"),
+    )
 
     def __repr__(self):
         return f"<Patient {self.mrn}: {self.last_name}, {self.first_name}>"
 
 
+class PatientICDCode(Base):
+    """One APCM billing ICD code of a patient.
+
+    Derived from Patient.apcm_icd_codes (still the column imports write) by
+    the SQLite triggers in ICD_CODE_TRIGGERS, so "patients with code X" is
+    an index lookup instead of a LIKE '%X%' scan of the CSV text.
+    """
+    __tablename__ = "patient_icd_codes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    patient_id = Column(
+        Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False
+    )
+    icd_code = Column(String(20), nullable=False)
+
+    __table_args__ = (
+        Index("ix_pic_patient_code", "patient_id", "icd_code", unique=True),
+        Index("ix_pic_code", "icd_code"),
+    )
+
+    def __repr__(self):
+        return f"<PatientICDCode patient_id={self.patient_id} {self.icd_code}>"
+
+
+def _icd_code_array(row: str) -> str:
+    # JSON array literal of the CSV entries (split on commas, semicolons or
+    # line breaks) for json_each; anything that still isn't valid JSON
+    # yields no codes rather than failing the patient write
+    csv = f"trim({row}.apcm_icd_codes)"
+    for old, new in (
+        ("'\\'", "'\\\\'"), ("'\"'", "'\\\"'"), ("char(9)", "' '"),
+        ("char(13)", "','"), ("char(10)", "','"), ("';'", "','"),
+    ):
+        csv = f"replace({csv}, {old}, {new})"
+    array = f"'[\"' || replace({csv}, ',', '\",\"') || '\"]'"
+    return f"CASE WHEN json_valid({array}) THEN {array} ELSE '[]' END"
+
+
+def _icd_code_insert(row: str) -> str:
+    return (
+        f"INSERT INTO patient_icd_codes (patient_id, icd_code) "
+        f"SELECT DISTINCT {row}.id, trim(value) "
+        f"FROM json_each({_icd_code_array(row)}) WHERE trim(value) != ''"
+    )
+
+
+ICD_CODE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS trg_patient_icd_codes_insert "
+    "AFTER INSERT ON patients WHEN NEW.apcm_icd_codes IS NOT NULL BEGIN "
+    f"{_icd_code_insert('NEW')}; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_patient_icd_codes_update "
+    "AFTER UPDATE OF apcm_icd_codes ON patients "
+    "WHEN OLD.apcm_icd_codes IS NOT NEW.apcm_icd_codes BEGIN "
+    "DELETE FROM patient_icd_codes WHERE patient_id = NEW.id; "
+    f"{_icd_code_insert('NEW')}; END",
+)
+
+# Split codes for patients that have a CSV but no rows yet (databases
+# written before the table existed)
+ICD_CODE_BACKFILL = (
+    "INSERT INTO patient_icd_codes (patient_id, icd_code) "
+    "SELECT DISTINCT patients.id, trim(value) "
+    f"FROM patients, json_each({_icd_code_array('patients')}) "
+    "WHERE trim(value) != '' AND patients.apcm_icd_codes IS NOT NULL "
+    "AND NOT EXISTS (SELECT 1 FROM patient_icd_codes c "
+    "WHERE c.patient_id = patients.id)"
+)
+
+
 class Consent(Base):
     """Consent tracking for patient records retention."""
     __tablename__ = "consents"
@@ -117,7 +219,8 @@ class Consent(Base):
     status = Column(
         Enum(ConsentStatus),
         default=ConsentStatus.PENDING,
-        nullable=False
+        nullable=False,
+        index=True,
     )
 
     # Contact tracking
@@ -131,8 +234,8 @@ class Consent(Base):
     notes = Column(Text)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     patient = relationship("Patient", back_populates="consent")
@@ -141,6 +244,134 @@ class Consent(Base):
         return f"<Consent patient_id={self.patient_id} status={self.status.value}>"
 
 
+class ConsentStatsRollup(Base):
+    """Single-row roll-up of the dashboard consent counts.
+
+    Kept current by the SQLite triggers in CONSENT_STATS_TRIGGERS, so the
+    dashboard reads one row instead of counting both tables.
+    """
+    __tablename__ = "consent_stats"
+
+    id = Column(Integer, primary_key=True)  # always 1
+    total = Column(Integer, nullable=False, default=0)
+    matched = Column(Integer, nullable=False, default=0)
+    consented = Column(Integer, nullable=False, default=0)
+    declined = Column(Integer, nullable=False, default=0)
+    pending = Column(Integer, nullable=False, default=0)
+    no_response = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ConsentStatsRollup total={self.total} consented={self.consented}>"
+
+
+# The dashboard read: plain columns (no ORM entity to hydrate), built once at
+# import because Streamlit re-executes page scripts on every rerun
+CONSENT_STATS_SELECT = select(
+    ConsentStatsRollup.total,
+    ConsentStatsRollup.matched,
+    ConsentStatsRollup.consented,
+    ConsentStatsRollup.declined,
+    ConsentStatsRollup.pending,
+    ConsentStatsRollup.no_response,
+).where(ConsentStatsRollup.id == 1)
+
+# Roll-up column -> consent status it counts (stored by enum name)
+_ROLLUP_STATUSES = {
+    "consented": ConsentStatus.CONSENTED.name,
+    "declined": ConsentStatus.DECLINED.name,
+    "pending": ConsentStatus.PENDING.name,
+    "no_response": ConsentStatus.NO_RESPONSE.name,
+}
+
+
+def _status_deltas(sign: str, row: str) -> str:
+    # "IS" rather than "=" so NULLs count as 0 instead of nulling the sum
+    return ", ".join(
+        f"{col} = {col} {sign} ({row}.status IS '{name}')"
+        for col, name in _ROLLUP_STATUSES.items()
+    )
+
+
+def _rollup_trigger(name: str, event: str, table: str, set_clause: str, when: str = "") -> str:
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} {when}"
+        f"BEGIN UPDATE consent_stats SET {set_clause}, "
+        f"updated_at = CURRENT_TIMESTAMP WHERE id = 1; END"
+    )
+
+
+CONSENT_STATS_TRIGGERS = (
+    _rollup_trigger(
+        "trg_consent_stats_patient_insert", "INSERT", "patients",
+        "total = total + 1, matched = matched + (NEW.spruce_matched IS 1)",
+    ),
+    _rollup_trigger(
+        "trg_consent_stats_patient_delete", "DELETE", "patients",
+        "total = total - 1, matched = matched - (OLD.spruce_matched IS 1)",
+    ),
+    _rollup_trigger(
+        "trg_consent_stats_patient_match", "UPDATE OF spruce_matched", "patients",
+        "matched = matched + (NEW.spruce_matched IS 1) - (OLD.spruce_matched IS 1)",
+        "WHEN OLD.spruce_matched IS NOT NEW.spruce_matched ",
+    ),
+    _rollup_trigger(
+        "trg_consent_stats_consent_insert", "INSERT", "consents",
+        _status_deltas("+", "NEW"),
+    ),
+    _rollup_trigger(
+        "trg_consent_stats_consent_delete", "DELETE", "consents",
+        _status_deltas("-", "OLD"),
+    ),
+    _rollup_trigger(
+        "trg_consent_stats_consent_status", "UPDATE OF status", "consents",
+        ", ".join(
+            f"{col} = {col} + (NEW.status IS '{name}') - (OLD.status IS '{name}')"
+            for col, name in _ROLLUP_STATUSES.items()
+        ),
+        "WHEN OLD.status IS NOT NEW.status ",
+    ),
+)
+
+CONSENT_STATUS_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS trg_patient_consent_status_insert "
+    "AFTER INSERT ON consents BEGIN UPDATE patients "
+    "SET current_consent_status = NEW.status WHERE id = NEW.patient_id; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_patient_consent_status_update "
+    "AFTER UPDATE OF status, patient_id ON consents BEGIN "
+    "UPDATE patients SET current_consent_status = NULL "
+    "WHERE id = OLD.patient_id AND OLD.patient_id IS NOT NEW.patient_id; "
+    "UPDATE patients SET current_consent_status = NEW.status "
+    "WHERE id = NEW.patient_id; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_patient_consent_status_delete "
+    "AFTER DELETE ON consents BEGIN UPDATE patients "
+    "SET current_consent_status = NULL WHERE id = OLD.patient_id; END",
+)
+
+# Re-sync patients.current_consent_status for rows that drifted (or for
+# databases created before the column existed)
+CONSENT_STATUS_BACKFILL = (
+    "UPDATE patients SET current_consent_status = "
+    "(SELECT status FROM consents WHERE consents.patient_id = patients.id) "
+    "WHERE current_consent_status IS NOT "
+    "(SELECT status FROM consents WHERE consents.patient_id = patients.id)"
+)
+
+# Recount everything from scratch; init_db runs this so the roll-up is
+# correct even for databases written before the triggers existed
+CONSENT_STATS_REBUILD = (
+    "INSERT OR REPLACE INTO consent_stats "
+    f"(id, total, matched, {', '.join(_ROLLUP_STATUSES)}, updated_at) "
+    "SELECT 1, (SELECT count(*) FROM patients), "
+    "(SELECT count(*) FROM patients WHERE spruce_matched IS 1), "
+    + ", ".join(
+        f"(SELECT count(*) FROM consents WHERE status = '{name}')"
+        for name in _ROLLUP_STATUSES.values()
+    )
+    + ", CURRENT_TIMESTAMP"
+)
+
+
 class AuditLog(Base):
     """HIPAA-compliant audit log for all data access and changes."""
     __tablename__ = "audit_logs"
@@ -158,15 +389,25 @@ class AuditLog(Base):
     user_name = Column(String(100))
 
     # Details
-    details = Column(Text)  # JSON string with specifics
+    details = Column(Text)  # Free-text summary (not JSON); filter on entity_* instead
     ip_address = Column(String(50))
 
     # Timestamp
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime, default=UTC_NOW, nullable=False, index=True)
 
     # Relationships
     patient = relationship("Patient", back_populates="audit_logs")
 
+    # Per-patient and per-action history in time order, so "latest N" tails
+    # read the index backwards with no sort step; the leading columns also
+    # serve plain patient_id / action lookups. (entity_type, entity_id)
+    # answers "who touched this record" directly.
+    __table_args__ = (
+        Index("ix_audit_patient_ts", "patient_id", "timestamp"),
+        Index("ix_audit_action_ts", "action", "timestamp"),
+        Index("ix_audit_entity", "entity_type", "entity_id"),
+    )
+
     def __repr__(self):
         return f"<AuditLog {self.action} {self.entity_type} at {self.timestamp}>"
 
@@ -189,12 +430,18 @@ class PatientNote(Base):
     is_pinned = Column(Boolean, default=False)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     patient = relationship("Patient", back_populates="notes")
 
+    # Notes page lists a patient's notes pinned-first, newest-first; this
+    # index yields that order directly (scanned backwards)
+    __table_args__ = (
+        Index("ix_notes_patient_pinned_ts", "patient_id", "is_pinned", "created_at"),
+    )
+
     def __repr__(self):
         return f"<PatientNote {self.id} for patient {self.patient_id}>"
 
@@ -204,7 +451,7 @@ class CarePlan(Base):
     __tablename__ = "care_plans"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
 
     # APCM Enrollment Info
     enrollment_date = Column(DateTime)
@@ -241,8 +488,8 @@ class CarePlan(Base):
     last_reviewed_by = Column(String(100))
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
     created_by = Column(String(100))
     updated_by = Column(String(100))
 
@@ -264,7 +511,7 @@ class CarePlanProblem(Base):
     __tablename__ = "care_plan_problems"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False)
+    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False, index=True)
 
     # Problem identification
     diagnosis_name = Column(String(255), nullable=False)
@@ -285,8 +532,8 @@ class CarePlanProblem(Base):
     sort_order = Column(Integer, default=0)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     care_plan = relationship("CarePlan", back_populates="problems")
@@ -300,7 +547,7 @@ class CarePlanMedication(Base):
     __tablename__ = "care_plan_medications"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False)
+    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False, index=True)
 
     # Medication details
     medication_name = Column(String(255), nullable=False)
@@ -324,8 +571,8 @@ class CarePlanMedication(Base):
     is_prn = Column(Boolean, default=False)  # As needed
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     care_plan = relationship("CarePlan", back_populates="medications")
@@ -339,7 +586,7 @@ class CarePlanAllergy(Base):
     __tablename__ = "care_plan_allergies"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False)
+    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False, index=True)
 
     allergen = Column(String(255), nullable=False)
     reaction = Column(Text)
@@ -348,8 +595,8 @@ class CarePlanAllergy(Base):
     is_active = Column(Boolean, default=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     care_plan = relationship("CarePlan", back_populates="allergies")
@@ -363,7 +610,7 @@ class CarePlanContact(Base):
     __tablename__ = "care_plan_contacts"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False)
+    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False, index=True)
 
     # Contact info
     name = Column(String(255), nullable=False)
@@ -377,8 +624,8 @@ class CarePlanContact(Base):
     organization = Column(String(255))
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     care_plan = relationship("CarePlan", back_populates="contacts")
@@ -392,7 +639,7 @@ class CarePlanImmunization(Base):
     __tablename__ = "care_plan_immunizations"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False)
+    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False, index=True)
 
     # Immunization/screening info
     item_type = Column(String(50))  # vaccine, screening
@@ -404,8 +651,8 @@ class CarePlanImmunization(Base):
     last_completed_date = Column(DateTime)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     care_plan = relationship("CarePlan", back_populates="immunizations")
@@ -419,7 +666,7 @@ class CarePlanStandingOrder(Base):
     __tablename__ = "care_plan_standing_orders"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False)
+    care_plan_id = Column(Integer, ForeignKey("care_plans.id"), nullable=False, index=True)
 
     # Standing order details
     name = Column(String(255), nullable=False)  # e.g., "Urinalysis orders"
@@ -429,8 +676,8 @@ class CarePlanStandingOrder(Base):
     is_active = Column(Boolean, default=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     # Relationships
     care_plan = relationship("CarePlan", back_populates="standing_orders")
@@ -474,8 +721,8 @@ class User(Base):
     last_activity = Column(DateTime)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=UTC_NOW)
+    updated_at = Column(DateTime, default=UTC_NOW, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<User {self.username} ({self.role.value})>"
@@ -7,12 +7,16 @@ Runs locally only (localhost:8501) for PHI protection.
 import streamlit as st
 import base64
 from pathlib import Path
-from database import init_db, get_session
-from database.models import Patient, Consent, ConsentStatus
+from database import init_db, get_scoped_session
+from database.models import CONSENT_STATS_SELECT
 
 
+@st.cache_data(show_spinner=False)
 def get_image_base64(image_path: Path) -> str:
-    """Load an image and return as base64 string for HTML embedding."""
+    """Load an image and return as base64 string for HTML embedding.
+
+    Cached per path, so reruns don't re-read and re-encode the icons.
+    """
     if image_path.exists():
         with open(image_path, "rb") as f:
             return base64.b64encode(f.read()).decode()
@@ -32,6 +36,28 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+@st.cache_data(ttl=30, show_spinner=False)
+def get_consent_stats():
+    """Get consent tracking statistics.
+
+    Cached for 30 seconds: Streamlit reruns this script on every widget
+    interaction, and the dashboard can lag consent changes by that much.
+    Call get_consent_stats.clear() to drop the cached counts.
+    """
+    session = get_scoped_session()
+    try:
+        # Counts are kept current by triggers (see ConsentStatsRollup)
+        return dict(session.execute(CONSENT_STATS_SELECT).one()._mapping)
+    finally:
+        session.close()
+
+
+def refresh_consent_stats():
+    """Drop any cached consent statistics and recompute them."""
+    get_consent_stats.clear()
+    return get_consent_stats()
+
+
 # Initialize database on first run
 @st.cache_resource
 def initialize_database():
@@ -40,6 +66,8 @@ def initialize_database():
     # Ensure admin user exists
     from auth import ensure_admin_exists
     ensure_admin_exists()
+    # Warm the dashboard counts for the first page render
+    refresh_consent_stats()
     return True
 
 initialize_database()
@@ -54,120 +82,135 @@ user = require_login()
 show_user_menu()
 
 
-def get_consent_stats():
-    """Get consent tracking statistics."""
-    session = get_session()
-    try:
-        total = session.query(Patient).count()
-        matched = session.query(Patient).filter(Patient.spruce_matched == True).count()
-
-        # Consent stats
-        consented = session.query(Consent).filter(
-            Consent.status == ConsentStatus.CONSENTED
-        ).count()
-        declined = session.query(Consent).filter(
-            Consent.status == ConsentStatus.DECLINED
-        ).count()
-        pending = session.query(Consent).filter(
-            Consent.status == ConsentStatus.PENDING
-        ).count()
-        no_response = session.query(Consent).filter(
-            Consent.status == ConsentStatus.NO_RESPONSE
-        ).count()
-
-        return {
-            "total": total,
-            "matched": matched,
-            "consented": consented,
-            "declined": declined,
-            "pending": pending,
-            "no_response": no_response,
-        }
-    finally:
-        session.close()
+def show_footer():
+    """Page footer, shared by the empty-state and dashboard renders."""
+    st.divider()
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.caption("Patient Explorer v1.0 | Home Team Medical Services")
+        st.caption("Building personal healthcare, one patient at a time.")
+    with col2:
+        st.caption("HIPAA Compliant | localhost:8501")
 
 
 # Main page content
 st.title("Patient Explorer")
 
-# Load brand icons for values grid
-icon_stethoscope = get_image_base64(ICONS_DIR / "HTnav_stethoscope.png")
-icon_clipboard = get_image_base64(ICONS_DIR / "HTnav_clipboard.png")
-icon_team = get_image_base64(ICONS_DIR / "HTnav_team.png")
-icon_ribbon = get_image_base64(ICONS_DIR / "HTnav_ribbon.png")
-icon_medical_bag = get_image_base64(ICONS_DIR / "HTnav_medical_bag_large.png")
+# Check if patients are loaded before building the mission box and
+# metrics: a first-run install only needs the getting-started text
+stats = get_consent_stats()
 
-# Welcome section with mission and values
-welcome_col1, welcome_col2 = st.columns([3, 1])
+if stats["total"] == 0:
+    st.info("📋 No patient data loaded yet.")
 
-with welcome_col1:
-    st.markdown(f"""
+    st.markdown("""
+    ### Getting Started
+
+    Patient data is stored securely in **Azure storage** and will load automatically
+    when available. To add new patient data:
+
+    1. **Go to Add Data** → Use the sidebar to navigate to the **Add Data** page
+    2. **Upload documents** → Screenshots, PDFs, or images from your EMR
+    3. **Use AI extraction** → Let the AI help extract patient information
+    4. **Import from OneNote** → Connect your clinic's OneNote notebooks
+
+    The system will automatically sync patient data from Azure storage when configured.
+    """)
+    show_footer()
+    st.stop()
+
+# Brand icons for the mission box, exposed to CSS as --icon-<name>
+ICON_FILES = {
+    "medical-bag": "HTnav_medical_bag_large.png",
+    "stethoscope": "HTnav_stethoscope.png",
+    "clipboard": "HTnav_clipboard.png",
+    "team": "HTnav_team.png",
+    "ribbon": "HTnav_ribbon.png",
+}
+
+
+def get_icon_css() -> str:
+    """Build one :root rule holding every brand icon as a data URL."""
+    return ":root {" + "".join(
+        f"--icon-{name}: url(data:image/png;base64,{get_image_base64(ICONS_DIR / filename)});"
+        for name, filename in ICON_FILES.items()
+    ) + "}"
+
+
+# Mission box styles and markup; icons come from get_icon_css()
+MISSION_HTML = """
     <style>
-    .mission-box {{
+    .mission-box {
         background: linear-gradient(135deg, #1e3a5f 0%, #2d5a87 100%);
         border-radius: 12px;
         padding: 24px 28px;
         margin-bottom: 24px;
         color: white;
-    }}
-    .mission-header {{
+    }
+    .mission-header {
         display: flex;
         align-items: center;
         gap: 16px;
         margin-bottom: 12px;
-    }}
-    .mission-header img {{
+    }
+    .ht-icon {
+        background-size: contain;
+        background-repeat: no-repeat;
+        background-position: center;
+    }
+    .mission-header .ht-icon {
         width: 48px;
         height: 48px;
-    }}
-    .mission-box h2 {{
+        flex-shrink: 0;
+    }
+    .mission-box h2 {
         color: #ffffff;
         margin: 0;
         font-size: 1.5rem;
-    }}
-    .mission-box p {{
+    }
+    .mission-box p {
         color: #e8f4f8;
         font-size: 1.05rem;
         line-height: 1.6;
-    }}
-    .mission-box .tagline {{
+    }
+    .mission-box .tagline {
         font-style: italic;
         color: #a8d4e6;
         border-left: 3px solid #4a9ece;
         padding-left: 16px;
         margin: 16px 0;
-    }}
-    .values-grid {{
+    }
+    .values-grid {
         display: grid;
         grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
         gap: 12px;
         margin-top: 16px;
-    }}
-    .value-item {{
+    }
+    .value-item {
         background: rgba(255,255,255,0.1);
         border-radius: 8px;
         padding: 12px 16px;
         text-align: center;
-    }}
-    .value-item img {{
+    }
+    .value-item .ht-icon {
         width: 32px;
         height: 32px;
-        margin-bottom: 8px;
-    }}
-    .value-item strong {{
+        margin: 0 auto 8px;
+    }
+    .value-item strong {
         color: #ffffff;
         display: block;
         margin-bottom: 4px;
-    }}
-    .value-item span {{
+    }
+    .value-item span {
         color: #c8e4f0;
         font-size: 0.9rem;
-    }}
+    }
     </style>
 
     <div class="mission-box">
         <div class="mission-header">
-            <img src="data:image/png;base64,{icon_medical_bag}" alt="Home Team">
+            <div class="ht-icon" style="background-image: var(--icon-medical-bag)" role="img" aria-label="Home Team"></div>
             <h2>Welcome to Home Team</h2>
         </div>
         <p class="tagline">
@@ -182,28 +225,45 @@ with welcome_col1:
         </p>
         <div class="values-grid">
             <div class="value-item">
-                <img src="data:image/png;base64,{icon_stethoscope}" alt="Personal Care">
+                <div class="ht-icon" style="background-image: var(--icon-stethoscope)" role="img" aria-label="Personal Care"></div>
                 <strong>Personal Care</strong>
                 <span>Patients are people, not numbers</span>
             </div>
             <div class="value-item">
-                <img src="data:image/png;base64,{icon_clipboard}" alt="Trust">
+                <div class="ht-icon" style="background-image: var(--icon-clipboard)" role="img" aria-label="Trust"></div>
                 <strong>Trust & Respect</strong>
                 <span>Earned through every interaction</span>
             </div>
             <div class="value-item">
-                <img src="data:image/png;base64,{icon_team}" alt="Team">
+                <div class="ht-icon" style="background-image: var(--icon-team)" role="img" aria-label="Team"></div>
                 <strong>Team Excellence</strong>
                 <span>Supporting each other's success</span>
             </div>
             <div class="value-item">
-                <img src="data:image/png;base64,{icon_ribbon}" alt="Growth">
+                <div class="ht-icon" style="background-image: var(--icon-ribbon)" role="img" aria-label="Growth"></div>
                 <strong>Continuous Growth</strong>
                 <span>Learning and improving together</span>
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+@st.cache_resource(show_spinner=False)
+def get_mission_html() -> str:
+    """Full mission-box markup, assembled once per process.
+
+    cache_resource hands back the same string object on every rerun
+    (cache_data would unpickle a fresh copy each time).
+    """
+    return f"<style>{get_icon_css()}</style>" + MISSION_HTML
+
+
+# Welcome section with mission and values
+welcome_col1, welcome_col2 = st.columns([3, 1])
+
+with welcome_col1:
+    st.markdown(get_mission_html(), unsafe_allow_html=True)
 
 with welcome_col2:
     # Display patient onboarding illustration
@@ -214,93 +274,65 @@ with welcome_col2:
 st.subheader("Consent Outreach & Tracking Dashboard")
 st.divider()
 
-# Check if patients are loaded
-stats = get_consent_stats()
-
-if stats["total"] == 0:
-    st.info("📋 No patient data loaded yet.")
-
-    st.markdown("""
-    ### Getting Started
-
-    Patient data is stored securely in **Azure storage** and will load automatically
-    when available. To add new patient data:
-
-    1. **Go to Add Data** → Use the sidebar to navigate to the **Add Data** page
-    2. **Upload documents** → Screenshots, PDFs, or images from your EMR
-    3. **Use AI extraction** → Let the AI help extract patient information
-    4. **Import from OneNote** → Connect your clinic's OneNote notebooks
-
-    The system will automatically sync patient data from Azure storage when configured.
-    """)
-else:
-    # Dashboard metrics
-    st.subheader("📊 Consent Tracking Overview")
+# Dashboard metrics
+st.subheader("📊 Consent Tracking Overview")
 
-    col1, col2, col3, col4 = st.columns(4)
+col1, col2, col3, col4 = st.columns(4)
 
-    with col1:
-        st.metric(
-            label="Total Patients",
-            value=stats["total"],
-            help="Total patients in the system"
-        )
+with col1:
+    st.metric(
+        label="Total Patients",
+        value=stats["total"],
+        help="Total patients in the system"
+    )
 
-    with col2:
-        st.metric(
-            label="Spruce Matched",
-            value=stats["matched"],
-            delta=f"{(stats['matched']/stats['total']*100):.0f}%" if stats["total"] > 0 else "0%",
-            help="Patients found in Spruce Health"
-        )
-
-    with col3:
-        st.metric(
-            label="Consented",
-            value=stats["consented"],
-            delta=f"{(stats['consented']/stats['total']*100):.0f}%" if stats["total"] > 0 else "0%",
-            delta_color="normal",
-            help="Patients who consented to records retention"
-        )
-
-    with col4:
-        st.metric(
-            label="Pending",
-            value=stats["pending"] + stats["no_response"],
-            help="Patients awaiting consent decision"
-        )
+with col2:
+    st.metric(
+        label="Spruce Matched",
+        value=stats["matched"],
+        delta=f"{(stats['matched']/stats['total']*100):.0f}%",
+        help="Patients found in Spruce Health"
+    )
+
+with col3:
+    st.metric(
+        label="Consented",
+        value=stats["consented"],
+        delta=f"{(stats['consented']/stats['total']*100):.0f}%",
+        delta_color="normal",
+        help="Patients who consented to records retention"
+    )
+
+with col4:
+    st.metric(
+        label="Pending",
+        value=stats["pending"] + stats["no_response"],
+        help="Patients awaiting consent decision"
+    )
 
-    st.divider()
+st.divider()
 
-    # Consent status breakdown
-    st.subheader("📋 Consent Status Breakdown")
+# Consent status breakdown
+st.subheader("📋 Consent Status Breakdown")
 
-    col1, col2 = st.columns([1, 2])
+col1, col2 = st.columns([1, 2])
 
-    with col1:
-        st.markdown(f"""
-        | Status | Count |
-        |--------|-------|
-        | ✅ Consented | {stats['consented']} |
-        | ❌ Declined | {stats['declined']} |
-        | ⏳ Pending | {stats['pending']} |
-        | 📭 No Response | {stats['no_response']} |
-        """)
+with col1:
+    st.markdown(f"""
+    | Status | Count |
+    |--------|-------|
+    | ✅ Consented | {stats['consented']} |
+    | ❌ Declined | {stats['declined']} |
+    | ⏳ Pending | {stats['pending']} |
+    | 📭 No Response | {stats['no_response']} |
+    """)
 
-    with col2:
-        # Simple progress toward goal
-        if stats["total"] > 0:
-            progress = (stats["consented"] + stats["declined"]) / stats["total"]
-            st.progress(progress, text=f"Outreach Progress: {progress*100:.1f}% complete")
+with col2:
+    # Simple progress toward goal (total > 0 here)
+    progress = (stats["consented"] + stats["declined"]) / stats["total"]
+    st.progress(progress, text=f"Outreach Progress: {progress*100:.1f}% complete")
 
-            remaining = stats["total"] - stats["consented"] - stats["declined"]
-            st.caption(f"{remaining} patients still need to be contacted")
+    remaining = stats["total"] - stats["consented"] - stats["declined"]
+    st.caption(f"{remaining} patients still need to be contacted")
 
-# Footer
-st.divider()
-col1, col2 = st.columns([2, 1])
-with col1:
-    st.caption("Patient Explorer v1.0 | Home Team Medical Services")
-    st.caption("Building personal healthcare, one patient at a time.")
-with col2:
-    st.caption("HIPAA Compliant | localhost:8501")
+show_footer()
@@ -46,21 +46,51 @@ Prerequisites for App-Only (V1.1):
 """
 
 import os
+import sys
+import copy
+import time
+import atexit
+import random
+import asyncio
+import functools
 import logging
-from typing import Optional, Dict, Any, List
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
+from html import escape as html_escape
+from pathlib import Path
 
 import httpx
-from msal import ConfidentialClientApplication
+import orjson
+from msal import ConfidentialClientApplication, SerializableTokenCache
 from dotenv import load_dotenv
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# HTTP/2 multiplexes concurrent Graph calls over one connection; httpx
+# needs the optional h2 package for it
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Graph is a single host, so keep more connections alive for longer than
+# httpx's defaults; pool is how long to wait for a free connection.
+# Responses come compressed: httpx's default Accept-Encoding asks for
+# gzip/deflate, plus br when the brotli package is installed.
+_HTTP_TIMEOUT = httpx.Timeout(connect=10.0, read=30.0, write=30.0, pool=5.0)
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20, max_connections=50, keepalive_expiry=120.0
+)
+
+
+@dataclass(slots=True)
 class OneNoteNotebook:
     """OneNote notebook metadata."""
     id: str
@@ -69,7 +99,7 @@ class OneNoteNotebook:
     sections: List[Dict[str, str]]
 
 
-@dataclass
+@dataclass(slots=True)
 class SharePointList:
     """SharePoint list metadata."""
     id: str
@@ -77,6 +107,186 @@ class SharePointList:
     web_url: str
     item_count: int
 
+# Optional file for MSAL's token cache, so a restarted process reuses a
+# still-valid app token instead of going back to Azure AD. It holds a live
+# bearer token: keep it on local, access-restricted storage (written 0600).
+TOKEN_CACHE_PATH = os.getenv("GRAPH_TOKEN_CACHE_PATH")
+
+# Planner assignment value for a new assignee; shared, never mutated
+_PLANNER_ASSIGNMENT = {"@odata.type": "#microsoft.graph.plannerAssignment", "orderHint": " !"}
+
+# Threads for fanning out independent blocking Graph calls
+# (e.g. get_plan_workspace); I/O-bound, so the GIL isn't a bottleneck
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="graph")
+
+# Client-side request rate, kept under Graph's per-app throttle so
+# concurrent callers don't trigger 429s in the first place
+DEFAULT_RPS = float(os.getenv("GRAPH_RPS", "10"))
+
+# Retry throttled (429) and transiently failing requests with exponential
+# backoff, honoring Retry-After. 502/504 may arrive after the server acted,
+# so non-idempotent POST/PATCH only retry 429/503.
+_RETRY_STATUSES = {429, 502, 503, 504}
+_ALWAYS_RETRY_STATUSES = {429, 503}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+_MAX_ATTEMPTS = 8
+_BACKOFF_BASE = 1.0  # seconds; doubles per attempt, plus up to this much jitter
+_BACKOFF_CAP = 64.0
+
+
+def _retry_delay(method: str, response: httpx.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a response, or None to give up.
+
+    Args:
+        method: HTTP method of the request
+        response: Response to the attempt
+        attempt: Zero-based attempt number
+    """
+    status = response.status_code
+    if status not in _RETRY_STATUSES or attempt + 1 >= _MAX_ATTEMPTS:
+        return None
+    if status not in _ALWAYS_RETRY_STATUSES and method.upper() not in _IDEMPOTENT_METHODS:
+        return None
+
+    delay = _BACKOFF_BASE * 2 ** attempt
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form; fall back to the backoff
+    return min(delay, _BACKOFF_CAP) + random.uniform(0, _BACKOFF_BASE)
+
+
+# Graph timestamps end in "Z"; fromisoformat accepts that directly from
+# Python 3.11, earlier versions need it spelled as an offset
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value: str) -> datetime:
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+
+
+# Site, user and group lookups barely change during a session, so their
+# results are kept per client for an hour
+LOOKUP_TTL = 3600.0
+_LOOKUP_CACHE_SIZE = 256
+
+
+def _ttl_cached(method):
+    """Cache a GraphClient lookup method's result for LOOKUP_TTL seconds.
+
+    Entries live in the client's _lookup_cache keyed by method and
+    arguments; the oldest entry is dropped once the cache is full.
+    Callers get a deep copy, so mutating a result can't change what
+    later callers see.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        hit = self._lookup_cache.get(key)
+        if hit is not None and now < hit[0]:
+            return copy.deepcopy(hit[1])
+
+        value = method(self, *args, **kwargs)
+        # Re-insert at the end, so a refreshed entry counts as newest
+        self._lookup_cache.pop(key, None)
+        if len(self._lookup_cache) >= _LOOKUP_CACHE_SIZE:
+            self._lookup_cache.pop(next(iter(self._lookup_cache)))
+        self._lookup_cache[key] = (now + LOOKUP_TTL, value)
+        return copy.deepcopy(value)
+
+    return wrapper
+
+
+class GraphRateLimiter:
+    """Token bucket shared by every request a GraphClient makes.
+
+    Like azure_document's bucket, a caller reserves a token under a lock
+    and is told how long to wait, so threads and coroutines share it.
+    Graph's RateLimit-Remaining / RateLimit-Reset response headers, when
+    present, shrink the bucket so we slow down before being throttled.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait on the event loop until a token is available."""
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def available(self) -> float:
+        """Tokens available right now (negative when callers are queued)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def update(self, headers: httpx.Headers) -> None:
+        """Clamp the bucket to the server's remaining quota, if reported."""
+        remaining = headers.get("RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+            reset = float(headers.get("RateLimit-Reset", 0))
+        except ValueError:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            # With the quota used up, hold everyone until it resets
+            limit = remaining if remaining > 0 else -reset * self.rate
+            self._tokens = min(self._tokens, limit)
+
+
+def _async_http_client() -> httpx.AsyncClient:
+    """Open an AsyncClient for one async helper call.
+
+    Use it as ``async with`` inside the coroutine: its pooled connections
+    are tied to the running event loop, and Streamlit starts a new loop
+    (asyncio.run) for every call.
+    """
+    return httpx.AsyncClient(
+        timeout=_HTTP_TIMEOUT,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=20),
+        http2=_HTTP2,
+    )
+
+
+# OneNote pages use HTML format; the shell is the same for every page
+_PAGE_TEMPLATE = (
+    "<!DOCTYPE html><html><head><title>{title}</title></head>"
+    "<body>{body}</body></html>"
+)
+
+
+def _onenote_page_html(title: str, content: str) -> bytes:
+    """Wrap page content (already HTML) in the document OneNote expects."""
+    return _PAGE_TEMPLATE.format(title=html_escape(title), body=content).encode("utf-8")
+
 
 class GraphClient:
     """Client for Microsoft Graph API.
@@ -86,12 +296,15 @@ class GraphClient:
 
     GRAPH_URL = "https://graph.microsoft.com/v1.0"
     SCOPES = ["https://graph.microsoft.com/.default"]
+    BATCH_LIMIT = 20  # Max subrequests per $batch call
 
     def __init__(
         self,
         tenant_id: Optional[str] = None,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
+        rps: float = DEFAULT_RPS,
+        token_cache_path: Optional[str] = TOKEN_CACHE_PATH,
     ):
         """Initialize Graph client.
 
@@ -99,6 +312,9 @@ class GraphClient:
             tenant_id: Azure AD tenant ID (defaults to env var)
             client_id: App registration client ID (defaults to env var)
             client_secret: App client secret (defaults to env var)
+            rps: Maximum requests per second across all of this client's calls
+            token_cache_path: File to persist MSAL's token cache in
+                (defaults to GRAPH_TOKEN_CACHE_PATH; in-memory if unset)
         """
         self.tenant_id = tenant_id or os.getenv("AZURE_TENANT_ID")
         self.client_id = client_id or os.getenv("AZURE_CLIENT_ID")
@@ -108,37 +324,110 @@ class GraphClient:
             raise ValueError("Missing Azure AD credentials (AZURE_TENANT_ID, AZURE_CLIENT_ID, AZURE_CLIENT_SECRET)")
 
         # Initialize MSAL app
+        self._token_cache_path = Path(token_cache_path) if token_cache_path else None
+        self.token_cache = self._load_token_cache()
         self.app = ConfidentialClientApplication(
             client_id=self.client_id,
             client_credential=self.client_secret,
             authority=f"https://login.microsoftonline.com/{self.tenant_id}",
+            token_cache=self.token_cache,
         )
 
-        self._access_token = None
-        self.http_client = httpx.Client(timeout=30.0)
+        # Current token and its monotonic expiry; refreshed under the lock
+        self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+        # Request headers for the current token, rebuilt only on refresh
+        self._base_headers: Dict[str, str] = {}
+        # Decoded claims of the token they were decoded from (get_token_info)
+        self._token_claims: Optional[Dict[str, Any]] = None
+        self._token_claims_for: Optional[str] = None
+        self._limiter = GraphRateLimiter(rps)
+        self._lookup_cache: Dict[tuple, Tuple[float, Any]] = {}
+        self.http_client = httpx.Client(
+            timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS, http2=_HTTP2
+        )
+
+    def _load_token_cache(self) -> SerializableTokenCache:
+        """Create the MSAL token cache, restoring it from disk if configured."""
+        cache = SerializableTokenCache()
+        path = self._token_cache_path
+        if path and path.exists():
+            try:
+                cache.deserialize(path.read_text())
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable token cache {path}: {e}")
+        return cache
+
+    def _save_token_cache(self):
+        """Write the token cache to disk if MSAL changed it."""
+        path = self._token_cache_path
+        if not path or not self.token_cache.has_state_changed:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp file (mkstemp opens it 0600) + os.replace, so a
+            # crash never leaves a torn cache and concurrent writers never
+            # share a temp file
+            fd, tmp_file = tempfile.mkstemp(
+                dir=path.parent, prefix=path.name + ".", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(self.token_cache.serialize())
+                os.replace(tmp_file, path)
+            except BaseException:
+                os.unlink(tmp_file)
+                raise
+            self.token_cache.has_state_changed = False
+        except OSError as e:
+            logger.warning(f"Failed to save token cache: {e}")
+
+    def _token_is_fresh(self) -> bool:
+        """True if the cached token has more than a minute left."""
+        return bool(self._access_token) and time.monotonic() < self._token_expires_at - 60
 
     def _get_token(self, force_refresh: bool = False) -> str:
         """Get or refresh access token.
 
+        The token is reused until a minute before it expires, so most
+        requests skip MSAL entirely.
+
         Args:
             force_refresh: If True, clear token cache and get fresh token
         """
-        if force_refresh:
-            # Clear MSAL's internal token cache
-            for account in self.app.get_accounts():
-                self.app.remove_account(account)
-            # Clear internal cache (for client credentials, tokens are stored differently)
-            if hasattr(self.app, '_token_cache'):
-                self.app._token_cache._cache.clear()
-
-        result = self.app.acquire_token_for_client(scopes=self.SCOPES)
-
-        if "access_token" in result:
-            self._access_token = result["access_token"]
+        if not force_refresh and self._token_is_fresh():
             return self._access_token
-        else:
-            error = result.get("error_description", result.get("error", "Unknown error"))
-            raise Exception(f"Failed to acquire token: {error}")
+
+        with self._token_lock:
+            # Another thread may have refreshed while we waited
+            if not force_refresh and self._token_is_fresh():
+                return self._access_token
+
+            if force_refresh:
+                # App-only tokens aren't tied to accounts, so drop the
+                # client's cached tokens directly
+                if hasattr(self.app, "remove_tokens_for_client"):
+                    self.app.remove_tokens_for_client()
+                else:
+                    # MSAL < 1.23 has no public way to do this
+                    self.app.token_cache._cache.clear()
+
+            result = self.app.acquire_token_for_client(scopes=self.SCOPES)
+            self._save_token_cache()
+
+            if "access_token" in result:
+                self._access_token = result["access_token"]
+                self._token_expires_at = time.monotonic() + int(result.get("expires_in", 0))
+                self._base_headers = {
+                    "Authorization": f"Bearer {self._access_token}",
+                    "Content-Type": "application/json",
+                }
+                self._token_claims = self._token_claims_for = None
+                return self._access_token
+            else:
+                error = result.get("error_description", result.get("error", "Unknown error"))
+                raise Exception(f"Failed to acquire token: {error}")
 
     def get_token_info(self) -> Dict[str, Any]:
         """Get info about the current access token for debugging.
@@ -147,9 +436,10 @@ class GraphClient:
             Dict with token metadata (expiry, scopes in token, etc.)
         """
         import base64
-        import json
 
         token = self._get_token()
+        if token == self._token_claims_for:
+            return dict(self._token_claims)
 
         # JWT tokens have 3 parts: header.payload.signature
         parts = token.split('.')
@@ -164,9 +454,9 @@ class GraphClient:
                 payload += '=' * padding
 
             decoded = base64.urlsafe_b64decode(payload)
-            claims = json.loads(decoded)
+            claims = orjson.loads(decoded)
 
-            return {
+            info = {
                 "app_id": claims.get("appid"),
                 "tenant": claims.get("tid"),
                 "roles": claims.get("roles", []),  # This shows granted permissions
@@ -177,17 +467,18 @@ class GraphClient:
         except Exception as e:
             return {"error": f"Failed to decode token: {e}"}
 
+        # Same token, same claims: decode once per token
+        self._token_claims, self._token_claims_for = info, token
+        return dict(info)
+
     def force_new_token(self) -> str:
         """Force acquisition of a completely new token (clears all caches)."""
         return self._get_token(force_refresh=True)
 
     def _get_headers(self) -> Dict[str, str]:
-        """Get request headers with authorization."""
-        token = self._get_token()
-        return {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+        """Get a copy of the request headers, safe for the caller to modify."""
+        self._get_token()
+        return dict(self._base_headers)
 
     def _request(
         self,
@@ -196,6 +487,7 @@ class GraphClient:
         json: Optional[Dict] = None,
         data: Optional[bytes] = None,
         content_type: Optional[str] = None,
+        params: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """Make a Graph API request.
 
@@ -205,24 +497,113 @@ class GraphClient:
             json: JSON body
             data: Raw body data
             content_type: Content type for raw data
+            params: Query parameters (URL-encoded by httpx)
 
         Returns:
             Response JSON
         """
-        url = f"{self.GRAPH_URL}{endpoint}"
-        headers = self._get_headers()
+        return self._send_prebuilt(
+            self._build_request(method, endpoint, json, data, content_type, params)
+        )
 
-        if content_type:
-            headers["Content-Type"] = content_type
+    def _build_request(
+        self,
+        method: str,
+        endpoint: str,
+        json: Optional[Dict] = None,
+        data: Optional[bytes] = None,
+        content_type: Optional[str] = None,
+        params: Optional[Dict[str, str]] = None,
+    ) -> httpx.Request:
+        """Build (but don't send) a Graph request; arguments as for _request.
 
-        response = self.http_client.request(
-            method=method,
-            url=url,
+        Bulk callers can build one request and pass it to _send_prebuilt
+        repeatedly, changing only request.url between sends, instead of
+        re-parsing the URL and re-merging headers per call.
+        """
+        self._get_token()
+        # Shared dict is only read by httpx; copy it only to override the type
+        headers = self._base_headers
+        if content_type:
+            headers = {**headers, "Content-Type": content_type}
+        if json is not None:
+            # Serialized once with orjson (base headers are application/json)
+            data = orjson.dumps(json)
+
+        return self.http_client.build_request(
+            method,
+            f"{self.GRAPH_URL}{endpoint}",
             headers=headers,
-            json=json,
             content=data,
+            params=params,
         )
 
+    def _send_prebuilt(self, request: httpx.Request) -> Dict[str, Any]:
+        """Send a request from _build_request, with rate limiting and retries.
+
+        Returns:
+            Response JSON
+        """
+        # The token may have been refreshed since the request was built
+        self._get_token()
+        request.headers["Authorization"] = self._base_headers["Authorization"]
+
+        for attempt in range(_MAX_ATTEMPTS):
+            self._limiter.acquire()
+            response = self.http_client.send(request)
+            self._limiter.update(response.headers)
+            delay = _retry_delay(request.method, response, attempt)
+            if delay is None:
+                break
+            logger.warning(f"Graph API {response.status_code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+        return self._parse_response(response)
+
+    async def _arequest(
+        self,
+        http: httpx.AsyncClient,
+        method: str,
+        endpoint: str,
+        json: Optional[Dict] = None,
+        data: Optional[bytes] = None,
+        content_type: Optional[str] = None,
+        params: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Async version of _request, sent on the caller's AsyncClient.
+
+        An AsyncClient's connections belong to the event loop that opened
+        them, so it is never stored on this (shared, sync) client; see
+        _async_http_client.
+        """
+        self._get_token()
+        headers = self._base_headers
+        if content_type:
+            headers = {**headers, "Content-Type": content_type}
+        if json is not None:
+            data = orjson.dumps(json)
+
+        for attempt in range(_MAX_ATTEMPTS):
+            await self._limiter.acquire_async()
+            response = await http.request(
+                method=method,
+                url=f"{self.GRAPH_URL}{endpoint}",
+                headers=headers,
+                content=data,
+                params=params,
+            )
+            self._limiter.update(response.headers)
+            delay = _retry_delay(method, response, attempt)
+            if delay is None:
+                break
+            logger.warning(f"Graph API {response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        return self._parse_response(response)
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+        """Return a Graph response's JSON, raising on error statuses."""
         if response.status_code >= 400:
             logger.error(f"Graph API error: {response.status_code} - {response.text}")
             raise Exception(f"Graph API error: {response.status_code} - {response.text}")
@@ -230,7 +611,81 @@ class GraphClient:
         if response.status_code == 204:  # No content
             return {}
 
-        return response.json()
+        return orjson.loads(response.content)
+
+    def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several Graph requests through POST /$batch.
+
+        Graph accepts up to BATCH_LIMIT subrequests per call, so a longer
+        list goes out in chunks; each chunk costs one round trip instead
+        of one per request.
+
+        Args:
+            requests: Subrequests as {"method", "url"[, "body", "headers"]},
+                with url relative to GRAPH_URL (e.g. "/planner/plans/{id}")
+
+        Returns:
+            One {"status", "headers", "body"} dict per request, in order
+        """
+        responses: List[Dict[str, Any]] = []
+        for start in range(0, len(requests), self.BATCH_LIMIT):
+            chunk = requests[start:start + self.BATCH_LIMIT]
+            payload = []
+            for i, req in enumerate(chunk):
+                sub = {"id": str(i), "method": req.get("method", "GET"), "url": req["url"]}
+                if "body" in req:
+                    sub["body"] = req["body"]
+                    sub["headers"] = {"Content-Type": "application/json", **req.get("headers", {})}
+                elif "headers" in req:
+                    sub["headers"] = req["headers"]
+                payload.append(sub)
+
+            result = self._request("POST", "/$batch", json={"requests": payload})
+            by_id = {r["id"]: r for r in result.get("responses", [])}
+            responses.extend(by_id.get(str(i), {"status": 0}) for i in range(len(chunk)))
+
+        return responses
+
+    @staticmethod
+    def _batch_body(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a batch subresponse body, raising like _request on errors."""
+        status = response.get("status", 0)
+        if not 200 <= status < 300:
+            logger.error(f"Graph API batch error: {status} - {response.get('body')}")
+            raise Exception(f"Graph API error: {status} - {response.get('body')}")
+        return response.get("body") or {}
+
+    def _paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, str]] = None,
+        top: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every item of a collection, following @odata.nextLink.
+
+        Graph returns collections a page at a time; without following the
+        next links, list calls silently stop after the first page.
+
+        Args:
+            endpoint: Collection endpoint (without base URL)
+            params: Query parameters for the first page
+            top: Page size to request, for endpoints that support $top
+        """
+        if top:
+            params = {**(params or {}), "$top": str(top)}
+
+        request = self._build_request("GET", endpoint, params=params)
+        while request is not None:
+            result = self._send_prebuilt(request)
+            yield from result.get("value", [])
+            # The next link is an absolute URL carrying the full query,
+            # including $skiptoken; send it as-is
+            next_link = result.get("@odata.nextLink")
+            request = (
+                self.http_client.build_request("GET", next_link, headers=self._base_headers)
+                if next_link
+                else None
+            )
 
     # =========================================================================
     # OneNote Operations
@@ -257,14 +712,12 @@ class GraphClient:
             # Requires delegated auth
             endpoint = "/me/onenote/notebooks"
 
-        result = self._request("GET", endpoint)
-
         notebooks = []
-        for nb in result.get("value", []):
+        for nb in self._paginate(endpoint, top=100):
             notebooks.append(OneNoteNotebook(
                 id=nb["id"],
                 name=nb["displayName"],
-                created=datetime.fromisoformat(nb["createdDateTime"].replace("Z", "+00:00")),
+                created=_parse_iso(nb["createdDateTime"]),
                 sections=[],
             ))
 
@@ -288,11 +741,9 @@ class GraphClient:
         else:
             endpoint = f"/me/onenote/notebooks/{notebook_id}/sections"
 
-        result = self._request("GET", endpoint)
-
         return [
             {"id": s["id"], "name": s["displayName"]}
-            for s in result.get("value", [])
+            for s in self._paginate(endpoint)
         ]
 
     def create_onenote_page(
@@ -311,23 +762,33 @@ class GraphClient:
         Returns:
             Created page info
         """
-        # OneNote pages use HTML format
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{title}</title>
-        </head>
-        <body>
-            {content}
-        </body>
-        </html>
-        """
-
         return self._request(
             "POST",
             f"/me/onenote/sections/{section_id}/pages",
-            data=html_content.encode("utf-8"),
+            data=_onenote_page_html(title, content),
+            content_type="application/xhtml+xml",
+        )
+
+    async def acreate_onenote_page(
+        self,
+        http: httpx.AsyncClient,
+        section_id: str,
+        title: str,
+        content: str,
+    ) -> Dict[str, Any]:
+        """Async version of create_onenote_page, for concurrent page creation.
+
+        Args:
+            http: AsyncClient opened on the running loop (_async_http_client)
+            section_id: Section ID
+            title: Page title
+            content: HTML content
+        """
+        return await self._arequest(
+            http,
+            "POST",
+            f"/me/onenote/sections/{section_id}/pages",
+            data=_onenote_page_html(title, content),
             content_type="application/xhtml+xml",
         )
 
@@ -351,10 +812,46 @@ class GraphClient:
 
         return response.text
 
+    def get_onenote_page_content_stream(
+        self,
+        page_id: str,
+        sink: Callable[[bytes], Any],
+        chunk_size: int = 65536,
+    ) -> int:
+        """Stream a OneNote page's HTML to sink without buffering it all.
+
+        For callers that write the page to a file or hash it, this avoids
+        holding the whole body (and its decoded str copy) in memory.
+
+        Args:
+            page_id: OneNote page ID
+            sink: Called with each chunk of raw bytes, e.g. file.write
+            chunk_size: Bytes per chunk
+
+        Returns:
+            Total bytes streamed
+        """
+        url = f"{self.GRAPH_URL}/me/onenote/pages/{page_id}/content"
+        headers = self._get_headers()
+        headers["Accept"] = "text/html"
+
+        self._limiter.acquire()
+        with self.http_client.stream("GET", url, headers=headers) as response:
+            if response.status_code >= 400:
+                raise Exception(f"Failed to get page: {response.status_code}")
+
+            total = 0
+            for chunk in response.iter_bytes(chunk_size=chunk_size):
+                sink(chunk)
+                total += len(chunk)
+
+        return total
+
     # =========================================================================
     # SharePoint Operations
     # =========================================================================
 
+    @_ttl_cached
     def get_sharepoint_site(self, site_path: str) -> Dict[str, Any]:
         """Get SharePoint site info by path.
 
@@ -366,14 +863,14 @@ class GraphClient:
         """
         return self._request("GET", f"/sites/{site_path}")
 
+    @_ttl_cached
     def list_sharepoint_sites(self) -> List[Dict[str, Any]]:
         """List SharePoint sites accessible to the app.
 
         Returns:
             List of site info dicts
         """
-        result = self._request("GET", "/sites?search=*")
-        return result.get("value", [])
+        return list(self._paginate("/sites", {"search": "*"}))
 
     def list_sharepoint_lists(self, site_id: str) -> List[SharePointList]:
         """List SharePoint lists in a site.
@@ -384,10 +881,8 @@ class GraphClient:
         Returns:
             List of SharePointList objects
         """
-        result = self._request("GET", f"/sites/{site_id}/lists")
-
         lists = []
-        for lst in result.get("value", []):
+        for lst in self._paginate(f"/sites/{site_id}/lists"):
             lists.append(SharePointList(
                 id=lst["id"],
                 name=lst["displayName"],
@@ -415,15 +910,30 @@ class GraphClient:
         Returns:
             List of item dicts
         """
-        endpoint = f"/sites/{site_id}/lists/{list_id}/items?expand=fields"
+        return list(self.iter_list_items(site_id, list_id, select, filter_query))
 
+    def iter_list_items(
+        self,
+        site_id: str,
+        list_id: str,
+        select: Optional[List[str]] = None,
+        filter_query: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield items from a SharePoint list, fetching pages as needed.
+
+        Args:
+            site_id: SharePoint site ID
+            list_id: List ID
+            select: Fields to select
+            filter_query: OData filter query
+        """
+        params = {"expand": "fields"}
         if select:
-            endpoint += f"&$select={','.join(select)}"
+            params["$select"] = ",".join(select)
         if filter_query:
-            endpoint += f"&$filter={filter_query}"
+            params["$filter"] = filter_query
 
-        result = self._request("GET", endpoint)
-        return result.get("value", [])
+        return self._paginate(f"/sites/{site_id}/lists/{list_id}/items", params, top=999)
 
     def create_list_item(
         self,
@@ -543,8 +1053,7 @@ class GraphClient:
         Returns:
             List of task dicts
         """
-        result = self._request("GET", "/me/planner/tasks")
-        return result.get("value", [])
+        return list(self._paginate("/me/planner/tasks"))
 
     def list_group_plans(self, group_id: str) -> List[Dict[str, Any]]:
         """List Planner plans for a Microsoft 365 group.
@@ -555,8 +1064,7 @@ class GraphClient:
         Returns:
             List of plan dicts
         """
-        result = self._request("GET", f"/groups/{group_id}/planner/plans")
-        return result.get("value", [])
+        return list(self._paginate(f"/groups/{group_id}/planner/plans"))
 
     def get_plan_details(self, plan_id: str) -> Dict[str, Any]:
         """Get details for a Planner plan.
@@ -578,8 +1086,15 @@ class GraphClient:
         Returns:
             List of task dicts
         """
-        result = self._request("GET", f"/planner/plans/{plan_id}/tasks")
-        return result.get("value", [])
+        return list(self.iter_plan_tasks(plan_id))
+
+    def iter_plan_tasks(self, plan_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield task dicts one at a time, fetching pages as needed.
+
+        Args:
+            plan_id: Plan ID
+        """
+        return self._paginate(f"/planner/plans/{plan_id}/tasks")
 
     def list_plan_buckets(self, plan_id: str) -> List[Dict[str, Any]]:
         """List buckets in a Planner plan.
@@ -590,8 +1105,55 @@ class GraphClient:
         Returns:
             List of bucket dicts
         """
-        result = self._request("GET", f"/planner/plans/{plan_id}/buckets")
-        return result.get("value", [])
+        return list(self._paginate(f"/planner/plans/{plan_id}/buckets"))
+
+    def get_plan_full(self, plan_id: str) -> Dict[str, Any]:
+        """Get a plan with its tasks and buckets in one $batch round trip.
+
+        Batched subrequests aren't paginated, so tasks and buckets are the
+        first page only; use get_plan_workspace for larger plans.
+
+        Args:
+            plan_id: Plan ID
+
+        Returns:
+            Dict with "plan", "tasks" and "buckets"
+        """
+        plan, tasks, buckets = (
+            self._batch_body(r)
+            for r in self.batch([
+                {"url": f"/planner/plans/{plan_id}"},
+                {"url": f"/planner/plans/{plan_id}/tasks"},
+                {"url": f"/planner/plans/{plan_id}/buckets"},
+            ])
+        )
+        return {
+            "plan": plan,
+            "tasks": tasks.get("value", []),
+            "buckets": buckets.get("value", []),
+        }
+
+    def get_plan_workspace(self, plan_id: str) -> Dict[str, Any]:
+        """Get a plan with all its tasks and buckets, fetched concurrently.
+
+        The three reads run in parallel on a shared thread pool, so the
+        wait is roughly the slowest call rather than the sum; tasks and
+        buckets follow every page.
+
+        Args:
+            plan_id: Plan ID
+
+        Returns:
+            Dict with "plan", "tasks" and "buckets"
+        """
+        plan = _EXECUTOR.submit(self.get_plan_details, plan_id)
+        tasks = _EXECUTOR.submit(self.list_plan_tasks, plan_id)
+        buckets = _EXECUTOR.submit(self.list_plan_buckets, plan_id)
+        return {
+            "plan": plan.result(),
+            "tasks": tasks.result(),
+            "buckets": buckets.result(),
+        }
 
     def get_task_details(self, task_id: str) -> Dict[str, Any]:
         """Get task details including checklist and description.
@@ -636,10 +1198,8 @@ class GraphClient:
             body["bucketId"] = bucket_id
 
         if assigned_to:
-            body["assignments"] = {
-                user_id: {"@odata.type": "#microsoft.graph.plannerAssignment", "orderHint": " !"}
-                for user_id in assigned_to
-            }
+            # Every assignee gets the same (read-only) assignment object
+            body["assignments"] = dict.fromkeys(assigned_to, _PLANNER_ASSIGNMENT)
 
         if due_date:
             body["dueDateTime"] = due_date
@@ -669,13 +1229,13 @@ class GraphClient:
         response = self.http_client.patch(
             url,
             headers=headers,
-            json={"percentComplete": percent_complete},
+            content=orjson.dumps({"percentComplete": percent_complete}),
         )
 
         if response.status_code >= 400:
             raise Exception(f"Failed to update task: {response.status_code} - {response.text}")
 
-        return response.json() if response.content else {}
+        return orjson.loads(response.content) if response.content else {}
 
     # =========================================================================
     # Microsoft To Do Operations
@@ -687,8 +1247,7 @@ class GraphClient:
         Returns:
             List of task list dicts
         """
-        result = self._request("GET", "/me/todo/lists")
-        return result.get("value", [])
+        return list(self._paginate("/me/todo/lists"))
 
     def list_todo_tasks(self, list_id: str) -> List[Dict[str, Any]]:
         """List tasks in a To Do list.
@@ -699,8 +1258,15 @@ class GraphClient:
         Returns:
             List of task dicts
         """
-        result = self._request("GET", f"/me/todo/lists/{list_id}/tasks")
-        return result.get("value", [])
+        return list(self.iter_todo_tasks(list_id))
+
+    def iter_todo_tasks(self, list_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield task dicts one at a time, fetching pages as needed.
+
+        Args:
+            list_id: To Do list ID
+        """
+        return self._paginate(f"/me/todo/lists/{list_id}/tasks")
 
     def create_todo_task(
         self,
@@ -761,15 +1327,19 @@ class GraphClient:
     # User & Group Operations
     # =========================================================================
 
+    @_ttl_cached
     def list_my_groups(self) -> List[Dict[str, Any]]:
         """List Microsoft 365 groups the current user is a member of.
 
         Returns:
             List of group dicts
         """
-        result = self._request("GET", "/me/memberOf/microsoft.graph.group?$filter=groupTypes/any(c:c eq 'Unified')")
-        return result.get("value", [])
+        return list(self._paginate(
+            "/me/memberOf/microsoft.graph.group",
+            {"$filter": "groupTypes/any(c:c eq 'Unified')"},
+        ))
 
+    @_ttl_cached
     def get_user_by_email(self, email: str) -> Dict[str, Any]:
         """Get user info by email address.
 
@@ -790,14 +1360,91 @@ class GraphClient:
         Returns:
             List of member dicts
         """
-        result = self._request("GET", f"/groups/{group_id}/members")
-        return result.get("value", [])
+        return list(self.iter_group_members(group_id))
+
+    def iter_group_members(self, group_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield member dicts one at a time, fetching pages as needed.
+
+        Args:
+            group_id: Group ID
+        """
+        return self._paginate(f"/groups/{group_id}/members", top=999)
+
+
+class GraphClientPool:
+    """Spread Graph calls across several app registrations.
+
+    Graph throttles per app, so a tenant with more than one registration
+    can run large syncs faster by rotating between them. Each credential
+    gets its own GraphClient (own token, rate limiter and connections);
+    every method call is routed to the client with the most rate-limit
+    headroom, so the pool is used like a single GraphClient:
+
+        pool = GraphClientPool([(tenant, id_a, secret_a), (tenant, id_b, secret_b)])
+        pool.create_list_item(site_id, list_id, fields)
+    """
+
+    def __init__(self, credentials: List[Tuple[str, str, str]], **client_kwargs):
+        """Create one GraphClient per credential.
+
+        Args:
+            credentials: (tenant_id, client_id, client_secret) per app
+            client_kwargs: Passed to each GraphClient (e.g. rps). A
+                token_cache_path (or GRAPH_TOKEN_CACHE_PATH) gets the
+                client_id added to its name, so each app writes its own file.
+        """
+        if not credentials:
+            raise ValueError("GraphClientPool needs at least one credential")
+        cache_path = client_kwargs.pop("token_cache_path", TOKEN_CACHE_PATH)
+        self.clients = [
+            GraphClient(
+                tenant_id,
+                client_id,
+                client_secret,
+                token_cache_path=self._client_cache_path(cache_path, client_id),
+                **client_kwargs,
+            )
+            for tenant_id, client_id, client_secret in credentials
+        ]
+
+    @staticmethod
+    def _client_cache_path(cache_path: Optional[str], client_id: str) -> Optional[str]:
+        """Per-app token cache file: graph_tokens.json -> graph_tokens.<client_id>.json."""
+        if not cache_path:
+            return None
+        path = Path(cache_path)
+        return str(path.with_name(f"{path.stem}.{client_id}{path.suffix}"))
+
+    def pick(self) -> GraphClient:
+        """Return the client whose rate limiter has the most tokens left."""
+        return max(self.clients, key=lambda client: client._limiter.available())
+
+    def __getattr__(self, name: str):
+        # Only reached for GraphClient methods/attributes, not pool ones
+        return getattr(self.pick(), name)
+
+    def close(self):
+        """Close every client's HTTP connections."""
+        for client in self.clients:
+            client.close()
 
 
 # =============================================================================
 # Patient-Specific Helpers
 # =============================================================================
 
+@functools.lru_cache(maxsize=1)
+def get_default_graph_client() -> GraphClient:
+    """Return the process-wide GraphClient used by the helpers below.
+
+    Reusing one client keeps its MSAL token and pooled connections across
+    patient syncs instead of authenticating and handshaking per call.
+    """
+    client = GraphClient()
+    atexit.register(client.close)
+    return client
+
+
 def sync_patient_to_onenote(
     patient_data: Dict[str, Any],
     notebook_id: str,
@@ -817,34 +1464,83 @@ def sync_patient_to_onenote(
     Returns:
         Created/updated page info
     """
-    _client = client or GraphClient()
+    _client = client or get_default_graph_client()
+
+    title, html = _patient_page(patient_data)
+    return _client.create_onenote_page(section_id, title, html)
+
+
+async def sync_patients_to_onenote(
+    patients: List[Dict[str, Any]],
+    section_id: str,
+    client: Optional[GraphClient] = None,
+    max_concurrency: int = 8,
+) -> List[Dict[str, Any]]:
+    """Create OneNote pages for many patients concurrently.
+
+    Page creations overlap on one AsyncClient opened for this call, so N
+    patients take roughly the latency of N / max_concurrency requests
+    instead of N.
+
+    Args:
+        patients: Patient information dicts
+        section_id: Section ID for patient notes
+        client: Optional existing client
+        max_concurrency: Maximum page creations in flight at once
+
+    Returns:
+        Created page info, in the order of patients
+    """
+    _client = client or get_default_graph_client()
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-    # Build HTML content
-    html = f"""
-    <h1>{patient_data.get('last_name', '')}, {patient_data.get('first_name', '')}</h1>
-    <p><strong>MRN:</strong> {patient_data.get('mrn', 'N/A')}</p>
-    <p><strong>DOB:</strong> {patient_data.get('date_of_birth', 'N/A')}</p>
-    <p><strong>Phone:</strong> {patient_data.get('phone', 'N/A')}</p>
+    async with _async_http_client() as http:
+
+        async def create_one(patient_data: Dict[str, Any]) -> Dict[str, Any]:
+            title, html = _patient_page(patient_data)
+            async with semaphore:
+                return await _client.acreate_onenote_page(http, section_id, title, html)
+
+        return await asyncio.gather(*(create_one(p) for p in patients))
+
+
+# Patient page body, filled with HTML-escaped values by _patient_page
+_PATIENT_PAGE_TEMPLATE = """
+    <h1>{last_name}, {first_name}</h1>
+    <p><strong>MRN:</strong> {mrn}</p>
+    <p><strong>DOB:</strong> {date_of_birth}</p>
+    <p><strong>Phone:</strong> {phone}</p>
 
     <h2>APCM Status</h2>
-    <p><strong>Enrolled:</strong> {'Yes' if patient_data.get('apcm_enrolled') else 'No'}</p>
-    <p><strong>Level:</strong> {patient_data.get('apcm_level', 'N/A')}</p>
+    <p><strong>Enrolled:</strong> {apcm_enrolled}</p>
+    <p><strong>Level:</strong> {apcm_level}</p>
 
     <h2>Consent Status</h2>
-    <p><strong>Status:</strong> {patient_data.get('consent_status', 'Pending')}</p>
+    <p><strong>Status:</strong> {consent_status}</p>
 
     <hr/>
-    <p><em>Last synced: {datetime.now().isoformat()}</em></p>
+    <p><em>Last synced: {synced}</em></p>
     """
 
-    title = f"{patient_data.get('last_name', 'Unknown')}, {patient_data.get('first_name', '')} - {patient_data.get('mrn', 'No MRN')}"
 
-    result = _client.create_onenote_page(section_id, title, html)
+def _patient_page(patient_data: Dict[str, Any]) -> Tuple[str, str]:
+    """Build the (title, HTML body) of a patient's OneNote page."""
+    get = patient_data.get
+    html = _PATIENT_PAGE_TEMPLATE.format(
+        last_name=html_escape(str(get("last_name", ""))),
+        first_name=html_escape(str(get("first_name", ""))),
+        mrn=html_escape(str(get("mrn", "N/A"))),
+        date_of_birth=html_escape(str(get("date_of_birth", "N/A"))),
+        phone=html_escape(str(get("phone", "N/A"))),
+        apcm_enrolled="Yes" if get("apcm_enrolled") else "No",
+        apcm_level=html_escape(str(get("apcm_level", "N/A"))),
+        consent_status=html_escape(str(get("consent_status", "Pending"))),
+        synced=datetime.now().isoformat(),
+    )
 
-    if not client:
-        _client.close()
+    title = f"{get('last_name', 'Unknown')}, {get('first_name', '')} - {get('mrn', 'No MRN')}"
 
-    return result
+    return title, html
 
 
 def create_patient_sharepoint_list_item(
@@ -864,7 +1560,7 @@ def create_patient_sharepoint_list_item(
     Returns:
         Created item info
     """
-    _client = client or GraphClient()
+    _client = client or get_default_graph_client()
 
     # Map patient data to SharePoint list fields
     # Note: Field names depend on your SharePoint list schema
@@ -877,9 +1573,4 @@ def create_patient_sharepoint_list_item(
         "ConsentStatus": patient_data.get("consent_status", "Pending"),
     }
 
-    result = _client.create_list_item(site_id, list_id, fields)
-
-    if not client:
-        _client.close()
-
-    return result
+    return _client.create_list_item(site_id, list_id, fields)
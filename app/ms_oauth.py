@@ -49,15 +49,16 @@ Prerequisites:
 """
 
 import os
+import atexit
 import logging
 import secrets
 import hashlib
 import base64
-import json
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 from urllib.parse import urlencode, quote
-from pathlib import Path
 
 import streamlit as st
 import httpx
@@ -68,8 +69,22 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# File-based storage for OAuth state (survives Streamlit page reloads)
-OAUTH_STATE_FILE = Path(__file__).parent.parent / "data" / ".oauth_pending.json"
+# Pending OAuth flows outlive the Streamlit session that started them (the
+# redirect back opens a new one), so they are kept in a store keyed by state.
+# Set REDIS_URL to share them across processes; otherwise they stay in memory.
+OAUTH_STATE_TTL = 900  # seconds
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    import redis
+
+    _STATE_STORE = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+else:
+    _STATE_STORE = None
+
+# In-memory fallback: state -> (code_verifier, monotonic expiry)
+_pending_oauth: Dict[str, Tuple[str, float]] = {}
+_pending_oauth_lock = threading.Lock()
 
 
 # =============================================================================
@@ -161,9 +176,31 @@ DELEGATED_SCOPES = [
     "Tasks.ReadWrite.Shared",       # Read and write shared tasks
 ]
 
+# Fixed per process, so build the scope string and endpoints once
+_SCOPE_STR = " ".join(DELEGATED_SCOPES)
+_AUTHORITY = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/oauth2/v2.0"
+_AUTHORIZE_URL = f"{_AUTHORITY}/authorize"
+_TOKEN_URL = f"{_AUTHORITY}/token"
+
 # Graph API base URL
 GRAPH_URL = "https://graph.microsoft.com/v1.0"
 
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# One pooled client for the token endpoint and /me, so sign-in and token
+# refresh reuse warm TLS connections instead of handshaking on every call
+_HTTP = httpx.Client(
+    http2=_HTTP2,
+    timeout=httpx.Timeout(10.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+)
+atexit.register(_HTTP.close)
+
 
 # =============================================================================
 # PKCE Helper Functions
@@ -186,63 +223,67 @@ def _generate_state() -> str:
 
 
 # =============================================================================
-# File-Based OAuth State Persistence
+# Pending OAuth State Store
 # =============================================================================
 
+def _pending_oauth_key(state: str) -> str:
+    return f"oauth:pending:{state}"
+
+
 def _save_pending_oauth(state: str, code_verifier: str):
-    """Save pending OAuth state to file (survives page reload).
+    """Save a pending OAuth flow (survives page reload).
 
     Args:
         state: CSRF state parameter
         code_verifier: PKCE code verifier
     """
-    try:
-        OAUTH_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "state": state,
-            "code_verifier": code_verifier,
-            "created_at": datetime.now().isoformat(),
-        }
-        with open(OAUTH_STATE_FILE, "w") as f:
-            json.dump(data, f)
-        logger.info(f"Saved OAuth state: {state[:8]}...")
-    except Exception as e:
-        logger.error(f"Failed to save OAuth state: {e}")
+    if _STATE_STORE is not None:
+        try:
+            _STATE_STORE.setex(_pending_oauth_key(state), OAUTH_STATE_TTL, code_verifier)
+        except Exception as e:
+            logger.error(f"Failed to save OAuth state: {e}")
+            return
+    else:
+        now = time.monotonic()
+        with _pending_oauth_lock:
+            # Drop abandoned flows so the store can't grow without bound
+            for key in [k for k, (_, exp) in _pending_oauth.items() if exp <= now]:
+                del _pending_oauth[key]
+            _pending_oauth[state] = (code_verifier, now + OAUTH_STATE_TTL)
+    logger.info(f"Saved OAuth state: {state[:8]}...")
 
 
-def _load_pending_oauth() -> Optional[Dict[str, str]]:
-    """Load pending OAuth state from file.
+def _load_pending_oauth(state: str) -> Optional[str]:
+    """Consume the pending OAuth flow for a state.
 
-    Returns:
-        Dict with state and code_verifier, or None if not found/expired
-    """
-    try:
-        if not OAUTH_STATE_FILE.exists():
-            return None
+    The entry is removed as it is read, so each state can be redeemed
+    once.
 
-        with open(OAUTH_STATE_FILE, "r") as f:
-            data = json.load(f)
+    Args:
+        state: CSRF state parameter from the redirect
 
-        # Check if state is too old (15 minutes max)
-        created_at = datetime.fromisoformat(data.get("created_at", "2000-01-01"))
-        if datetime.now() - created_at > timedelta(minutes=15):
-            logger.warning("OAuth state expired")
-            _clear_pending_oauth()
+    Returns:
+        The flow's code_verifier, or None if unknown or expired
+    """
+    if _STATE_STORE is not None:
+        key = _pending_oauth_key(state)
+        try:
+            # MULTI/EXEC, so two redirects can't both redeem the state
+            code_verifier, _ = _STATE_STORE.pipeline().get(key).delete(key).execute()
+        except Exception as e:
+            logger.error(f"Failed to load OAuth state: {e}")
             return None
+        return code_verifier
 
-        return data
-    except Exception as e:
-        logger.error(f"Failed to load OAuth state: {e}")
+    with _pending_oauth_lock:
+        entry = _pending_oauth.pop(state, None)
+    if entry is None:
         return None
-
-
-def _clear_pending_oauth():
-    """Remove pending OAuth state file."""
-    try:
-        if OAUTH_STATE_FILE.exists():
-            OAUTH_STATE_FILE.unlink()
-    except Exception as e:
-        logger.error(f"Failed to clear OAuth state: {e}")
+    code_verifier, expires_at = entry
+    if time.monotonic() >= expires_at:
+        logger.warning("OAuth state expired")
+        return None
+    return code_verifier
 
 
 # =============================================================================
@@ -333,7 +374,7 @@ def get_auth_url() -> str:
     st.session_state.ms_oauth_code_verifier = code_verifier
     st.session_state.ms_oauth_state = state
 
-    # Also save to file (survives page reload after OAuth redirect)
+    # Also save to the state store (survives page reload after OAuth redirect)
     _save_pending_oauth(state, code_verifier)
 
     # Build authorization URL
@@ -342,16 +383,14 @@ def get_auth_url() -> str:
         "response_type": "code",
         "redirect_uri": REDIRECT_URI,
         "response_mode": "query",
-        "scope": " ".join(DELEGATED_SCOPES),
+        "scope": _SCOPE_STR,
         "state": state,
         "code_challenge": code_challenge,
         "code_challenge_method": "S256",
         "prompt": "select_account",  # Always show account picker
     }
 
-    auth_url = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/oauth2/v2.0/authorize?{urlencode(params)}"
-
-    return auth_url
+    return f"{_AUTHORIZE_URL}?{urlencode(params)}"
 
 
 def exchange_code_for_tokens(code: str, state: str) -> Optional[Dict[str, Any]]:
@@ -366,17 +405,20 @@ def exchange_code_for_tokens(code: str, state: str) -> Optional[Dict[str, Any]]:
     """
     _init_oauth_state()
 
-    # Try to get state from session first, then from file
+    # Try to get state from session first, then from the state store
     expected_state = st.session_state.ms_oauth_state
     code_verifier = st.session_state.ms_oauth_code_verifier
 
-    # If session state is empty, try to load from file (after page reload)
+    # Always consume the stored flow so the state can't be replayed
+    pending_verifier = _load_pending_oauth(state)
+
+    # If session state is empty, fall back to the stored flow (after page
+    # reload); finding it under this state is the CSRF check
     if not expected_state or not code_verifier:
-        pending = _load_pending_oauth()
-        if pending:
-            expected_state = pending.get("state")
-            code_verifier = pending.get("code_verifier")
-            logger.info(f"Loaded OAuth state from file: {expected_state[:8]}...")
+        if pending_verifier:
+            expected_state = state
+            code_verifier = pending_verifier
+            logger.info(f"Loaded OAuth state from store: {state[:8]}...")
 
     # Verify state
     if state != expected_state:
@@ -384,12 +426,9 @@ def exchange_code_for_tokens(code: str, state: str) -> Optional[Dict[str, Any]]:
         return None
 
     if not code_verifier:
-        logger.error("No code verifier found in session or file")
+        logger.error("No code verifier found in session or state store")
         return None
 
-    # Token endpoint
-    token_url = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/oauth2/v2.0/token"
-
     # Build token request
     data = {
         "client_id": AZURE_CLIENT_ID,
@@ -397,7 +436,7 @@ def exchange_code_for_tokens(code: str, state: str) -> Optional[Dict[str, Any]]:
         "code": code,
         "redirect_uri": REDIRECT_URI,
         "code_verifier": code_verifier,
-        "scope": " ".join(DELEGATED_SCOPES),
+        "scope": _SCOPE_STR,
     }
 
     # Add client secret if available (for confidential clients)
@@ -405,31 +444,29 @@ def exchange_code_for_tokens(code: str, state: str) -> Optional[Dict[str, Any]]:
         data["client_secret"] = AZURE_CLIENT_SECRET
 
     try:
-        with httpx.Client() as client:
-            response = client.post(token_url, data=data)
+        response = _HTTP.post(_TOKEN_URL, data=data)
 
-            if response.status_code != 200:
-                logger.error(f"Token exchange failed: {response.status_code} - {response.text}")
-                return None
+        if response.status_code != 200:
+            logger.error(f"Token exchange failed: {response.status_code} - {response.text}")
+            return None
 
-            tokens = response.json()
+        tokens = response.json()
 
-            # Calculate expiry time
-            expires_in = tokens.get("expires_in", 3600)
-            tokens["expires_at"] = (datetime.now() + timedelta(seconds=expires_in)).isoformat()
+        # Calculate expiry time
+        expires_in = tokens.get("expires_in", 3600)
+        tokens["expires_at"] = (datetime.now() + timedelta(seconds=expires_in)).isoformat()
 
-            # Store tokens
-            st.session_state.ms_oauth_tokens = tokens
+        # Store tokens
+        st.session_state.ms_oauth_tokens = tokens
 
-            # Get user info
-            _fetch_and_store_user_info(tokens["access_token"])
+        # Get user info
+        _fetch_and_store_user_info(tokens["access_token"])
 
-            # Clear PKCE values from session and file
-            st.session_state.ms_oauth_code_verifier = None
-            st.session_state.ms_oauth_state = None
-            _clear_pending_oauth()
+        # Clear PKCE values from session (the stored flow was consumed above)
+        st.session_state.ms_oauth_code_verifier = None
+        st.session_state.ms_oauth_state = None
 
-            return tokens
+        return tokens
 
     except Exception as e:
         logger.error(f"Token exchange error: {e}")
@@ -445,31 +482,28 @@ def refresh_tokens(refresh_token: str) -> Optional[Dict[str, Any]]:
     Returns:
         New token dict or None if refresh fails
     """
-    token_url = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}/oauth2/v2.0/token"
-
     data = {
         "client_id": AZURE_CLIENT_ID,
         "grant_type": "refresh_token",
         "refresh_token": refresh_token,
-        "scope": " ".join(DELEGATED_SCOPES),
+        "scope": _SCOPE_STR,
     }
 
     if AZURE_CLIENT_SECRET:
         data["client_secret"] = AZURE_CLIENT_SECRET
 
     try:
-        with httpx.Client() as client:
-            response = client.post(token_url, data=data)
+        response = _HTTP.post(_TOKEN_URL, data=data)
 
-            if response.status_code != 200:
-                logger.error(f"Token refresh failed: {response.status_code}")
-                return None
+        if response.status_code != 200:
+            logger.error(f"Token refresh failed: {response.status_code}")
+            return None
 
-            tokens = response.json()
-            expires_in = tokens.get("expires_in", 3600)
-            tokens["expires_at"] = (datetime.now() + timedelta(seconds=expires_in)).isoformat()
+        tokens = response.json()
+        expires_in = tokens.get("expires_in", 3600)
+        tokens["expires_at"] = (datetime.now() + timedelta(seconds=expires_in)).isoformat()
 
-            return tokens
+        return tokens
 
     except Exception as e:
         logger.error(f"Token refresh error: {e}")
@@ -479,20 +513,19 @@ def refresh_tokens(refresh_token: str) -> Optional[Dict[str, Any]]:
 def _fetch_and_store_user_info(access_token: str):
     """Fetch user info from Graph API and store in session."""
     try:
-        with httpx.Client() as client:
-            response = client.get(
-                f"{GRAPH_URL}/me",
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
+        response = _HTTP.get(
+            f"{GRAPH_URL}/me",
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
 
-            if response.status_code == 200:
-                user_info = response.json()
-                st.session_state.ms_oauth_user = {
-                    "id": user_info.get("id"),
-                    "display_name": user_info.get("displayName"),
-                    "email": user_info.get("mail") or user_info.get("userPrincipalName"),
-                    "job_title": user_info.get("jobTitle"),
-                }
+        if response.status_code == 200:
+            user_info = response.json()
+            st.session_state.ms_oauth_user = {
+                "id": user_info.get("id"),
+                "display_name": user_info.get("displayName"),
+                "email": user_info.get("mail") or user_info.get("userPrincipalName"),
+                "job_title": user_info.get("jobTitle"),
+            }
     except Exception as e:
         logger.error(f"Failed to fetch user info: {e}")
 
@@ -9,7 +9,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import get_session, init_db
+from database import count_rows, get_session, init_db
 from database.models import Patient, Consent, ConsentStatus, AuditLog
 
 st.set_page_config(
@@ -175,20 +175,23 @@ with st.sidebar:
         today = datetime.utcnow().date()
 
         # Count today's responses
-        todays_responses = session.query(Consent).filter(
+        todays_responses = count_rows(
+            session, Consent,
             Consent.response_date >= datetime.combine(today, datetime.min.time())
-        ).count()
+        )
 
         # Count by status
-        todays_consented = session.query(Consent).filter(
+        todays_consented = count_rows(
+            session, Consent,
             Consent.response_date >= datetime.combine(today, datetime.min.time()),
             Consent.status == ConsentStatus.CONSENTED
-        ).count()
+        )
 
-        todays_declined = session.query(Consent).filter(
+        todays_declined = count_rows(
+            session, Consent,
             Consent.response_date >= datetime.combine(today, datetime.min.time()),
             Consent.status == ConsentStatus.DECLINED
-        ).count()
+        )
 
         st.metric("Responses Today", todays_responses)
         col1, col2 = st.columns(2)
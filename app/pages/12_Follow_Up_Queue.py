@@ -9,7 +9,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import get_session, init_db
+from database import count_rows, get_session, init_db
 from database.models import Patient, Consent, ConsentStatus
 
 st.set_page_config(
@@ -374,13 +374,17 @@ with col2:
     # Calculate response rate
     session = get_session()
     try:
-        total_sent = session.query(Patient).join(Consent).filter(
-            Consent.last_outreach_date.isnot(None)
-        ).count()
-
-        responded = session.query(Patient).join(Consent).filter(
-            Consent.status.in_([ConsentStatus.CONSENTED, ConsentStatus.DECLINED])
-        ).count()
+        total_sent = count_rows(
+            session, Patient,
+            Consent.last_outreach_date.isnot(None),
+            join=Consent,
+        )
+
+        responded = count_rows(
+            session, Patient,
+            Consent.status.in_([ConsentStatus.CONSENTED, ConsentStatus.DECLINED]),
+            join=Consent,
+        )
 
         if total_sent > 0:
             rate = (responded / total_sent) * 100
@@ -9,7 +9,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import get_session, init_db
+from database import count_rows, get_session, init_db
 from database.models import Patient, PatientNote, AuditLog
 
 st.set_page_config(
@@ -204,14 +204,16 @@ with st.sidebar:
     if selected_patient:
         session = get_session()
         try:
-            note_count = session.query(PatientNote).filter(
+            note_count = count_rows(
+                session, PatientNote,
                 PatientNote.patient_id == selected_patient[0]
-            ).count()
+            )
 
-            pinned_count = session.query(PatientNote).filter(
+            pinned_count = count_rows(
+                session, PatientNote,
                 PatientNote.patient_id == selected_patient[0],
                 PatientNote.is_pinned == True
-            ).count()
+            )
 
             st.metric("Total Notes", note_count)
             st.metric("Pinned", pinned_count)
@@ -242,8 +244,8 @@ else:
         with col2:
             if patient.apcm_enrolled:
                 st.success("🏥 APCM Patient")
-            if patient.consent:
-                status = patient.consent.status.value.replace("_", " ").title()
+            if patient.current_consent_status:
+                status = patient.current_consent_status.value.replace("_", " ").title()
                 st.caption(f"Consent: {status}")
 
         with col3:
@@ -9,8 +9,9 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import get_session, init_db
+from database import count_rows, get_session, init_db
 from database.models import Patient, Consent, ConsentStatus, AuditLog, PatientNote
+from sqlalchemy import func, select
 
 st.set_page_config(
     page_title="Daily Summary - Patient Explorer",
@@ -50,22 +51,25 @@ def get_daily_stats(date: datetime.date):
         declined_today = sum(1 for c in responses_today if c.status == ConsentStatus.DECLINED)
 
         # Outreach today
-        outreach_today = session.query(Consent).filter(
+        outreach_today = count_rows(
+            session, Consent,
             Consent.last_outreach_date >= start,
             Consent.last_outreach_date <= end
-        ).count()
+        )
 
         # Notes created today
-        notes_today = session.query(PatientNote).filter(
+        notes_today = count_rows(
+            session, PatientNote,
             PatientNote.created_at >= start,
             PatientNote.created_at <= end
-        ).count()
+        )
 
         # Activity log entries today
-        activity_today = session.query(AuditLog).filter(
+        activity_today = count_rows(
+            session, AuditLog,
             AuditLog.timestamp >= start,
             AuditLog.timestamp <= end
-        ).count()
+        )
 
         return {
             "responses_total": len(responses_today),
@@ -84,30 +88,33 @@ def get_campaign_totals():
     """Get overall campaign totals."""
     session = get_session()
     try:
-        total_patients = session.query(Patient).count()
-        spruce_matched = session.query(Patient).filter(Patient.spruce_matched == True).count()
-        apcm_total = session.query(Patient).filter(Patient.apcm_enrolled == True).count()
+        total_patients = count_rows(session, Patient)
+        spruce_matched = count_rows(session, Patient, Patient.spruce_matched == True)
+        apcm_total = count_rows(session, Patient, Patient.apcm_enrolled == True)
 
         # Consent breakdown
-        consented = session.query(Consent).filter(Consent.status == ConsentStatus.CONSENTED).count()
-        declined = session.query(Consent).filter(Consent.status == ConsentStatus.DECLINED).count()
-        pending = session.query(Consent).filter(
+        consented = count_rows(session, Consent, Consent.status == ConsentStatus.CONSENTED)
+        declined = count_rows(session, Consent, Consent.status == ConsentStatus.DECLINED)
+        pending = count_rows(
+            session, Consent,
             Consent.status.in_([ConsentStatus.PENDING, ConsentStatus.INVITATION_SENT, ConsentStatus.NO_RESPONSE])
-        ).count()
+        )
 
         # With tokens
-        with_tokens = session.query(Patient).filter(Patient.consent_token.isnot(None)).count()
+        with_tokens = count_rows(session, Patient, Patient.consent_token.isnot(None))
 
         # APCM elections
-        apcm_continue = session.query(Patient).filter(
+        apcm_continue = count_rows(
+            session, Patient,
             Patient.apcm_enrolled == True,
             Patient.apcm_continue_with_hometeam == True
-        ).count()
+        )
 
-        apcm_decline = session.query(Patient).filter(
+        apcm_decline = count_rows(
+            session, Patient,
             Patient.apcm_enrolled == True,
             Patient.apcm_continue_with_hometeam == False
-        ).count()
+        )
 
         return {
             "total_patients": total_patients,
@@ -482,31 +489,36 @@ with col1:
         now = datetime.utcnow()
         cutoff_14 = now - timedelta(days=14)
 
-        overdue = session.query(Patient).join(Consent).filter(
+        overdue = count_rows(
+            session, Patient,
             Consent.status.in_([ConsentStatus.PENDING, ConsentStatus.NO_RESPONSE, ConsentStatus.INVITATION_SENT]),
-            Consent.last_outreach_date <= cutoff_14
-        ).count()
+            Consent.last_outreach_date <= cutoff_14,
+            join=Consent,
+        )
 
         if overdue > 0:
             st.warning(f"🔴 {overdue} patients need phone follow-up (14+ days)")
 
         # Day 7 reminders
         cutoff_7 = now - timedelta(days=7)
-        day7 = session.query(Patient).join(Consent).filter(
+        day7 = count_rows(
+            session, Patient,
             Consent.status.in_([ConsentStatus.PENDING, ConsentStatus.NO_RESPONSE, ConsentStatus.INVITATION_SENT]),
             Consent.last_outreach_date <= cutoff_7,
-            Consent.last_outreach_date > cutoff_14
-        ).count()
+            Consent.last_outreach_date > cutoff_14,
+            join=Consent,
+        )
 
         if day7 > 0:
             st.info(f"🟡 {day7} patients due for Day 7 reminder")
 
         # Never contacted
-        never = session.query(Patient).filter(
-            Patient.spruce_matched == True
-        ).outerjoin(Consent).filter(
-            (Consent.id.is_(None)) | (Consent.last_outreach_date.is_(None))
-        ).count()
+        never = session.execute(
+            select(func.count()).select_from(Patient).outerjoin(Consent).where(
+                Patient.spruce_matched == True,
+                (Consent.id.is_(None)) | (Consent.last_outreach_date.is_(None)),
+            )
+        ).scalar_one()
 
         if never > 0:
             st.caption(f"📭 {never} patients never contacted")
@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database import get_session, init_db
 from database.models import Patient, Consent, ConsentStatus, APCMStatus
-from data_loader import import_all_data, get_import_summary
+from data_loader import import_all_data, get_import_summary, fetch_spruce_contacts
 
 st.set_page_config(
     page_title="Patient List - Patient Explorer",
@@ -34,17 +34,34 @@ st.markdown("View and manage patient records for consent outreach.")
 st.divider()
 
 
+# Display label per status, formatted once instead of per row
+CONSENT_STATUS_LABELS = {
+    status: status.value.replace("_", " ").title() for status in ConsentStatus
+}
+
+
 def load_patients_from_db():
     """Load all patients with their consent status."""
     session = get_session()
     try:
-        patients = session.query(Patient).all()
+        # Only the displayed columns, as plain rows: no Patient objects to
+        # build and track for a read-only table
+        patients = session.query(
+            Patient.mrn,
+            Patient.first_name,
+            Patient.last_name,
+            Patient.preferred_name,
+            Patient.date_of_birth,
+            Patient.phone,
+            Patient.spruce_matched,
+            Patient.spruce_match_method,
+            Patient.apcm_enrolled,
+            Patient.current_consent_status,
+        ).all()
 
         data = []
         for p in patients:
-            consent_status = "No record"
-            if p.consent:
-                consent_status = p.consent.status.value.replace("_", " ").title()
+            consent_status = CONSENT_STATUS_LABELS.get(p.current_consent_status, "No record")
 
             # Format display name with preferred name
             display_name = p.first_name
@@ -123,6 +140,11 @@ with st.sidebar:
 
     st.caption("Imports patients, matches with Spruce API, and loads APCM data in one step.")
 
+    if st.button("♻️ Refresh Spruce Contacts", use_container_width=True, disabled=not can_import,
+                 help="Spruce contacts are cached for a few minutes between imports"):
+        fetch_spruce_contacts.cache_clear()
+        st.toast("Spruce contacts will be re-fetched on the next import")
+
     st.divider()
 
     # Filters
@@ -49,7 +49,7 @@ show_user_menu()
 try:
     from autoscribe.prompt_manager import get_prompt_manager, PromptType
     from autoscribe.audit import get_audit_logger, AuditEvent
-    from components.user_banner import show_user_banner, init_session_tracking, get_user_id
+    from components.user_banner import show_user_banner, init_session_tracking, get_user_id, get_session_duration
 except ImportError as e:
     st.error(f"Failed to import AutoScribe modules: {e}")
     st.stop()
@@ -915,6 +915,6 @@ with st.expander("ℹ️ Session Info"):
     st.caption(f"User: {getattr(user, 'email', user_id)}")
     st.caption(f"Note Type: {note_type}")
 
-    if "autoscribe_session_start" in st.session_state:
-        duration = datetime.now() - st.session_state.autoscribe_session_start
-        st.caption(f"Session Duration: {int(duration.total_seconds() // 60)} minutes")
+    duration = get_session_duration()
+    if duration is not None:
+        st.caption(f"Session Duration: {duration // 60} minutes")
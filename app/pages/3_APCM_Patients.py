@@ -141,8 +141,8 @@ def get_apcm_patients_from_db():
         data = []
         for p in patients:
             consent_status = "No record"
-            if p.consent:
-                consent_status = p.consent.status.value.replace("_", " ").title()
+            if p.current_consent_status:
+                consent_status = p.current_consent_status.value.replace("_", " ").title()
 
             # Format display name
             display_name = f"{p.last_name}, {p.first_name}"
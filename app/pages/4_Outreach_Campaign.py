@@ -9,7 +9,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import get_session, init_db
+from database import count_rows, get_session, init_db
 from database.models import Patient, Consent, ConsentStatus, APCMStatus
 from consent_tokens import (
     batch_create_tokens,
@@ -605,10 +605,11 @@ with tabs[4]:
         with col2:
             st.markdown("### Token Status")
 
-            total = session.query(Patient).count()
-            with_token = session.query(Patient).filter(
+            total = count_rows(session, Patient)
+            with_token = count_rows(
+                session, Patient,
                 Patient.consent_token.isnot(None)
-            ).count()
+            )
             without_token = total - with_token
 
             token_df = pd.DataFrame([
@@ -628,17 +629,20 @@ with tabs[4]:
 
         col1, col2, col3, col4 = st.columns(4)
 
-        apcm_total = session.query(Patient).filter(
+        apcm_total = count_rows(
+            session, Patient,
             Patient.apcm_enrolled == True
-        ).count()
+        )
 
-        apcm_continue = session.query(Patient).filter(
+        apcm_continue = count_rows(
+            session, Patient,
             Patient.apcm_continue_with_hometeam == True
-        ).count()
+        )
 
-        apcm_decline = session.query(Patient).filter(
+        apcm_decline = count_rows(
+            session, Patient,
             Patient.apcm_continue_with_hometeam == False
-        ).count()
+        )
 
         apcm_pending = apcm_total - apcm_continue - apcm_decline
 
@@ -706,8 +710,8 @@ with tabs[5]:
 
                 # Consent status
                 consent_status = "N/A"
-                if p.consent:
-                    consent_status = p.consent.status.value.replace("_", " ").title()
+                if p.current_consent_status:
+                    consent_status = p.current_consent_status.value.replace("_", " ").title()
 
                 token_data.append({
                     "MRN": p.mrn,
@@ -11,7 +11,9 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
+import asyncio
 import sys
+import time
 import base64
 from io import BytesIO
 
@@ -69,6 +71,9 @@ if "add_data_processed_uploads" not in st.session_state:
 if "add_data_extracted_data" not in st.session_state:
     st.session_state.add_data_extracted_data = {}
 
+if "add_data_ocr_jobs" not in st.session_state:
+    st.session_state.add_data_ocr_jobs = []  # (document name, Future) pairs
+
 if "selected_notebook" not in st.session_state:
     st.session_state.selected_notebook = None
 
@@ -76,6 +81,24 @@ if "selected_sections" not in st.session_state:
     st.session_state.selected_sections = []
 
 
+# Collect background OCR jobs once they have all finished
+ocr_jobs = st.session_state.add_data_ocr_jobs
+if ocr_jobs and all(future.done() for _, future in ocr_jobs):
+    all_text = []
+    for name, future in ocr_jobs:
+        try:
+            all_text.append(f"**{name}:**\n{future.result().content}")
+        except Exception as e:
+            all_text.append(f"**{name}:** [OCR failed: {e}]")
+
+    st.session_state.add_data_messages.append({
+        "role": "assistant",
+        "content": "**OCR Extracted Text:**\n\n" + "\n\n---\n\n".join(all_text)
+    })
+    st.session_state.add_data_ocr_jobs = []
+    st.toast("Text extracted! See AI Chat tab.")
+
+
 # =============================================================================
 # Sidebar - Services Status & Settings
 # =============================================================================
@@ -250,25 +273,27 @@ with tabs[0]:
         action_cols = st.columns(4)
 
         with action_cols[0]:
-            if st.button("🔍 Run OCR Only", use_container_width=True):
+            if st.session_state.add_data_ocr_jobs:
+                done = sum(future.done() for _, future in st.session_state.add_data_ocr_jobs)
+                st.button(
+                    f"⏳ OCR {done}/{len(st.session_state.add_data_ocr_jobs)}",
+                    use_container_width=True,
+                    disabled=True,
+                )
+            elif st.button("🔍 Run OCR Only", use_container_width=True):
                 if doc_available:
-                    with st.spinner("Extracting text..."):
-                        try:
-                            from azure_document import DocumentClient
-                            client = DocumentClient()
-                            all_text = []
-
-                            for img in st.session_state.add_data_images:
-                                result = client.analyze_document(img["bytes"], "prebuilt-read")
-                                all_text.append(f"**{img.get('name', 'Document')}:**\n{result.content}")
-
-                            st.session_state.add_data_messages.append({
-                                "role": "assistant",
-                                "content": "**OCR Extracted Text:**\n\n" + "\n\n---\n\n".join(all_text)
-                            })
-                            st.success("Text extracted! See AI Chat tab.")
-                        except Exception as e:
-                            st.error(f"OCR Error: {e}")
+                    try:
+                        from azure_document import DocumentClient
+                        client = DocumentClient()
+
+                        # Runs in the background; results are collected on a later rerun
+                        st.session_state.add_data_ocr_jobs = [
+                            (img.get("name", "Document"), client.submit_analyze(img["bytes"], "prebuilt-read"))
+                            for img in st.session_state.add_data_images
+                        ]
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"OCR Error: {e}")
                 else:
                     st.error("Document Intelligence not available")
 
@@ -491,14 +516,18 @@ with tabs[2]:
                         from azure_document import DocumentClient
                         doc_client = DocumentClient()
 
-                        for i, img in enumerate(st.session_state.add_data_images):
-                            try:
-                                result = doc_client.analyze_document(img["bytes"], "prebuilt-read")
-                                if result.content:
-                                    img_name = img.get("name", f"Image {i+1}")
-                                    extracted_texts.append(f"**{img_name}:**\n{result.content}")
-                            except Exception as e:
-                                extracted_texts.append(f"**Image {i+1}:** [OCR failed: {e}]")
+                        images = st.session_state.add_data_images
+                        results = asyncio.run(doc_client.analyze_many(
+                            [img["bytes"] for img in images],
+                            "prebuilt-read",
+                            return_exceptions=True,
+                        ))
+                        for i, (img, result) in enumerate(zip(images, results)):
+                            if isinstance(result, Exception):
+                                extracted_texts.append(f"**Image {i+1}:** [OCR failed: {result}]")
+                            elif result.content:
+                                img_name = img.get("name", f"Image {i+1}")
+                                extracted_texts.append(f"**{img_name}:**\n{result.content}")
 
                     # Build system prompt based on extraction targets
                     target_instructions = ""
@@ -698,3 +727,9 @@ st.caption("""
 - **AI Chat**: Ask the AI to extract specific patient information
 - **Extracted Data**: Review and save extracted data to patient records
 """)
+
+
+# Keep polling while background OCR is running (after the page has rendered)
+if st.session_state.add_data_ocr_jobs:
+    time.sleep(1)
+    st.rerun()
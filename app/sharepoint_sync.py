@@ -93,6 +93,15 @@ def _get_file_hash(file_path: Path) -> Optional[str]:
         return None
 
 
+def _checkpoint_local_db(release: bool = False) -> None:
+    """Flush the SQLite WAL into patients.db before file-level copies."""
+    try:
+        from database import checkpoint_db
+        checkpoint_db(release=release)
+    except Exception as e:
+        logger.warning(f"Could not checkpoint local database: {e}")
+
+
 def is_sync_enabled() -> bool:
     """Check if SharePoint sync is enabled.
 
@@ -211,6 +220,7 @@ def get_sync_status() -> Dict[str, Any]:
     # Check local database
     local_db = DEFAULT_LOCAL_DB
     if local_db.exists():
+        _checkpoint_local_db()
         status["local_exists"] = True
         status["local_hash"] = _get_file_hash(local_db)
         status["local_size"] = local_db.stat().st_size
@@ -267,6 +277,8 @@ def download_from_sharepoint(
         return False, f"Remote database not found: {remote_db}"
 
     try:
+        _checkpoint_local_db(release=True)
+
         # Backup local file if it exists
         if backup_local and local_db.exists():
             backup_path = local_db.with_suffix(
@@ -338,6 +350,7 @@ def upload_to_sharepoint(
         Path(sharepoint_path).mkdir(parents=True, exist_ok=True)
 
         # Copy to SharePoint
+        _checkpoint_local_db()
         shutil.copy2(local_db, remote_db)
 
         # Update config with upload timestamp
@@ -690,6 +703,8 @@ def download_from_sharepoint_graph(
     local_db = DEFAULT_LOCAL_DB
 
     try:
+        _checkpoint_local_db(release=True)
+
         # Backup local file if it exists
         if backup_local and local_db.exists():
             backup_path = local_db.with_suffix(
@@ -758,6 +773,7 @@ def upload_to_sharepoint_graph(
 
     try:
         # Read local file
+        _checkpoint_local_db()
         with open(local_db, "rb") as f:
             content = f.read()
 
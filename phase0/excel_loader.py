@@ -7,7 +7,7 @@ Supports the column aliases defined in the architecture documentation.
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 import pandas as pd
 from loguru import logger
@@ -46,8 +46,18 @@ def map_columns(df: pd.DataFrame) -> dict[str, str]:
 
     Returns a dict mapping our field names to actual column names in the DataFrame.
     """
+    return map_column_names(df.columns)
+
+
+def map_column_names(columns) -> dict[str, str]:
+    """
+    Map a sequence of header names to our field names.
+
+    Returns a dict mapping our field names to the matching header names.
+    The last header wins when two normalize to the same name.
+    """
     column_map = {}
-    df_columns = {normalize_column_name(c): c for c in df.columns}
+    df_columns = {normalize_column_name(str(c)): c for c in columns}
 
     for field_name, aliases in COLUMN_ALIASES.items():
         for alias in aliases:
@@ -86,15 +96,94 @@ def clean_phone(value) -> Optional[str]:
     return digits if digits else None
 
 
-def load_patients_from_excel(file_path: str | Path) -> list[Patient]:
+def _iter_sheet_rows(file_path: Path) -> Iterator[tuple]:
     """
-    Load patient records from an Excel file.
+    Yield the first worksheet's header row, then each data row, as tuples.
+
+    .xlsx/.xlsm files are streamed with openpyxl in read-only mode, so rows
+    are read straight from the sheet XML without building a DataFrame or
+    the full cell cache. Legacy .xls files fall back to pandas (xlrd).
+    """
+    if file_path.suffix.lower() not in (".xlsx", ".xlsm"):
+        df = pd.read_excel(file_path)
+        yield tuple(str(c) for c in df.columns)
+        yield from df.itertuples(index=False, name=None)
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        # Same placeholder names pandas gives blank header cells
+        yield tuple(
+            str(h).strip() if h is not None else f"Unnamed: {i}"
+            for i, h in enumerate(header)
+        )
+        yield from rows
+    finally:
+        wb.close()
+
+
+def _row_to_patient_data(row: tuple, column_idx: dict[str, int]) -> dict[str, Any]:
+    """Convert one sheet row into Patient keyword arguments."""
+    patient_data = {}
+
+    # Extract mapped fields
+    for field_name, idx in column_idx.items():
+        value = row[idx] if idx < len(row) else None
+
+        # Handle special fields
+        if field_name == "date_of_birth":
+            value = parse_date(value)
+        elif field_name == "last_visit_date":
+            value = parse_date(value)
+        elif field_name == "phone":
+            value = clean_phone(value)
+        elif pd.isna(value):
+            value = None
+        else:
+            value = str(value).strip() if value else None
+
+        patient_data[field_name] = value
+
+    # Handle combined patient_name field -> split into first/last
+    if "patient_name" in patient_data and patient_data["patient_name"]:
+        full_name = patient_data.pop("patient_name")
+        # Common formats: "Last, First" or "First Last"
+        if "," in full_name:
+            # "Last, First Middle" format
+            parts = full_name.split(",", 1)
+            patient_data["last_name"] = parts[0].strip()
+            if len(parts) > 1:
+                first_parts = parts[1].strip().split()
+                patient_data["first_name"] = first_parts[0] if first_parts else ""
+        else:
+            # "First Last" format
+            parts = full_name.split()
+            if len(parts) >= 2:
+                patient_data["first_name"] = parts[0]
+                patient_data["last_name"] = parts[-1]
+            elif len(parts) == 1:
+                patient_data["last_name"] = parts[0]
+
+    return patient_data
+
+
+def iter_patients_from_excel(
+    file_path: str | Path,
+    errors: Optional[list[dict]] = None,
+) -> Iterator[Patient]:
+    """
+    Stream patient records from an Excel file one row at a time.
 
     Args:
         file_path: Path to the Excel file (.xlsx or .xls)
+        errors: Optional list that receives {"row", "error"} for bad rows
 
-    Returns:
-        List of Patient objects
+    Yields:
+        Patient objects
 
     Raises:
         FileNotFoundError: If file doesn't exist
@@ -106,13 +195,12 @@ def load_patients_from_excel(file_path: str | Path) -> list[Patient]:
 
     logger.info(f"Loading patients from {file_path}")
 
-    # Load Excel file
-    df = pd.read_excel(file_path)
-    logger.info(f"Found {len(df)} rows in Excel file")
-    logger.debug(f"Columns: {list(df.columns)}")
+    rows = _iter_sheet_rows(file_path)
+    header = list(next(rows))
+    logger.debug(f"Columns: {header}")
 
     # Map columns
-    column_map = map_columns(df)
+    column_map = map_column_names(header)
     logger.info(f"Mapped columns: {column_map}")
 
     # Check required columns - need MRN and either (last_name) or (patient_name)
@@ -125,61 +213,39 @@ def load_patients_from_excel(file_path: str | Path) -> list[Patient]:
             missing.append("mrn")
         if not has_name:
             missing.append("last_name or patient_name")
-        raise ValueError(f"Missing required columns: {missing}. Found: {list(df.columns)}")
+        rows.close()
+        raise ValueError(f"Missing required columns: {missing}. Found: {header}")
 
-    # Convert rows to Patient objects
-    patients = []
-    errors = []
+    column_idx = {field: header.index(col) for field, col in column_map.items()}
 
-    for idx, row in df.iterrows():
+    # Convert rows to Patient objects
+    for row_num, row in enumerate(rows, start=2):  # Row 1 is the header
+        if all(v is None for v in row):
+            continue  # Blank spacer row
         try:
-            patient_data = {}
-
-            # Extract mapped fields
-            for field_name, excel_col in column_map.items():
-                value = row.get(excel_col)
-
-                # Handle special fields
-                if field_name == "date_of_birth":
-                    value = parse_date(value)
-                elif field_name == "last_visit_date":
-                    value = parse_date(value)
-                elif field_name == "phone":
-                    value = clean_phone(value)
-                elif pd.isna(value):
-                    value = None
-                else:
-                    value = str(value).strip() if value else None
-
-                patient_data[field_name] = value
-
-            # Handle combined patient_name field -> split into first/last
-            if "patient_name" in patient_data and patient_data["patient_name"]:
-                full_name = patient_data.pop("patient_name")
-                # Common formats: "Last, First" or "First Last"
-                if "," in full_name:
-                    # "Last, First Middle" format
-                    parts = full_name.split(",", 1)
-                    patient_data["last_name"] = parts[0].strip()
-                    if len(parts) > 1:
-                        first_parts = parts[1].strip().split()
-                        patient_data["first_name"] = first_parts[0] if first_parts else ""
-                else:
-                    # "First Last" format
-                    parts = full_name.split()
-                    if len(parts) >= 2:
-                        patient_data["first_name"] = parts[0]
-                        patient_data["last_name"] = parts[-1]
-                    elif len(parts) == 1:
-                        patient_data["last_name"] = parts[0]
-
-            # Create patient
-            patient = Patient(**patient_data)
-            patients.append(patient)
-
+            yield Patient(**_row_to_patient_data(row, column_idx))
         except Exception as e:
-            errors.append({"row": idx + 2, "error": str(e)})  # +2 for header and 0-index
-            logger.warning(f"Error parsing row {idx + 2}: {e}")
+            if errors is not None:
+                errors.append({"row": row_num, "error": str(e)})
+            logger.warning(f"Error parsing row {row_num}: {e}")
+
+
+def load_patients_from_excel(file_path: str | Path) -> list[Patient]:
+    """
+    Load patient records from an Excel file.
+
+    Args:
+        file_path: Path to the Excel file (.xlsx or .xls)
+
+    Returns:
+        List of Patient objects
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If required columns are missing
+    """
+    errors = []
+    patients = list(iter_patients_from_excel(file_path, errors))
 
     logger.info(f"Successfully loaded {len(patients)} patients")
     if errors:
@@ -8,6 +8,7 @@ Authentication uses Bearer token in Authorization header.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from typing import Any, Optional
 
@@ -126,34 +127,52 @@ class SpruceClient:
         """
         client = self._get_client()
         all_contacts = []
-        pagination_token = None
 
         logger.info("Fetching contacts from Spruce...")
 
-        while True:
-            params = {"limit": limit}
-            if pagination_token:
-                params["paginationToken"] = pagination_token
+        # Pages are cursor-linked, so they cannot be requested in parallel.
+        # Instead the next page is requested in the background as soon as its
+        # token is known, overlapping the round-trip with parsing this page.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="spruce-contacts") as pool:
+            pending = pool.submit(self._get_contacts_page, client, limit, None)
 
-            response = client.get("/contacts", params=params)
-            data = self._handle_response(response)
+            while pending is not None:
+                data = pending.result()
 
-            contacts = data.get("contacts", data.get("data", []))
-            for c in contacts:
-                contact = self._parse_contact(c)
-                if contact:
-                    all_contacts.append(contact)
+                # Check for more pages
+                if data.get("hasMore") and data.get("paginationToken"):
+                    pending = pool.submit(
+                        self._get_contacts_page, client, limit, data["paginationToken"]
+                    )
+                else:
+                    pending = None
 
-            # Check for more pages
-            if data.get("hasMore") and data.get("paginationToken"):
-                pagination_token = data["paginationToken"]
-                logger.debug(f"Fetched {len(all_contacts)} contacts, getting next page...")
-            else:
-                break
+                contacts = data.get("contacts", data.get("data", []))
+                for c in contacts:
+                    contact = self._parse_contact(c)
+                    if contact:
+                        all_contacts.append(contact)
+
+                if pending is not None:
+                    logger.debug(f"Fetched {len(all_contacts)} contacts, getting next page...")
 
         logger.info(f"Fetched {len(all_contacts)} total contacts from Spruce")
         return all_contacts
 
+    def _get_contacts_page(
+        self,
+        client: httpx.Client,
+        limit: int,
+        pagination_token: Optional[str],
+    ) -> dict[str, Any]:
+        """Fetch one page of the /contacts listing."""
+        params = {"limit": limit}
+        if pagination_token:
+            params["paginationToken"] = pagination_token
+
+        response = client.get("/contacts", params=params)
+        return self._handle_response(response)
+
     def _parse_contact(self, data: dict[str, Any]) -> Optional[SpruceContact]:
         """Parse API response into SpruceContact model."""
         try: